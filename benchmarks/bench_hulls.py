@@ -0,0 +1,197 @@
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from berg_problems.chapter_1 import hull_from_vertices
+from berg_problems.chapter_1 import simple_polygon_over_points
+from problems.convex_hull import convex_hull
+from problems.convex_hull import convex_hull_cubic
+from problems.convex_hull import convex_hull_dynamic
+from problems.convex_hull import convex_hull_graham_scan
+from problems.convex_hull import convex_hull_incremental
+from problems.convex_hull import convex_hull_incremental_fast
+from problems.convex_hull import convex_hull_jarvis_march
+from problems.convex_hull import convex_hull_monotone_chain
+from problems.convex_hull import convex_hull_quad
+
+"""
+    Benchmark suite of the hull algorithms
+
+    Every algorithm is timed on every distribution at growing sizes and the wall time, the peak
+    traced memory and the hull size are emitted as JSON. A size is skipped when the time of the previous
+    size, scaled by the worst case complexity of the algorithm, would exceed the time budget.
+
+    Run with: python -m benchmarks.bench_hulls --sizes 10 100 1000 --output results.json
+"""
+
+
+DEFAULT_SIZES = [10, 100, 1000, 10 ** 4, 10 ** 5, 10 ** 6, 10 ** 7]
+
+
+def uniform_square(rng: np.random.Generator, size: int) -> np.ndarray:
+    return rng.random((size, 2))
+
+
+def uniform_disk(rng: np.random.Generator, size: int) -> np.ndarray:
+
+    radius = np.sqrt(rng.random(size))
+    theta = rng.random(size) * 2 * np.pi
+
+    return np.column_stack((radius * np.cos(theta), radius * np.sin(theta)))
+
+
+# every point is a hull vertex
+def on_circle(rng: np.random.Generator, size: int) -> np.ndarray:
+
+    theta = rng.random(size) * 2 * np.pi
+    return np.column_stack((np.cos(theta), np.sin(theta)))
+
+
+def gaussian(rng: np.random.Generator, size: int) -> np.ndarray:
+    return rng.normal(size=(size, 2))
+
+
+# integer points on the sides and the diagonal of a square, with many duplicates and collinear hull points
+def collinear_heavy(rng: np.random.Generator, size: int) -> np.ndarray:
+
+    t = rng.integers(0, 1000, size).astype(np.float64)
+    side = rng.integers(0, 5, size)
+
+    xs = np.choose(side, [t, np.full(size, 1000.0), 1000.0 - t, np.zeros(size), t])
+    ys = np.choose(side, [np.zeros(size), t, np.full(size, 1000.0), 1000.0 - t, t])
+
+    return np.column_stack((xs, ys))
+
+
+DISTRIBUTIONS = {
+    'uniform_square': uniform_square,
+    'uniform_disk': uniform_disk,
+    'on_circle': on_circle,
+    'gaussian': gaussian,
+    'collinear_heavy': collinear_heavy,
+}
+
+
+def as_list(points: np.ndarray) -> list:
+    return list(map(tuple, points.tolist()))
+
+
+# name -> (prepares the input outside of the timed region, runs the algorithm, worst case growth exponent)
+ALGORITHMS = {
+    'quad': (as_list, convex_hull_quad, 4),
+    'cubic': (as_list, convex_hull_cubic, 3),
+    'jarvis_march': (as_list, convex_hull_jarvis_march, 2),
+    'incremental': (as_list, convex_hull_incremental, 2),
+    'incremental_fast': (as_list, convex_hull_incremental_fast, 2),
+    'graham_scan': (as_list, convex_hull_graham_scan, 1),
+    'dynamic': (as_list, convex_hull_dynamic, 1),
+    'monotone_chain': (np.ascontiguousarray, convex_hull_monotone_chain, 1),
+    'auto': (as_list, convex_hull, 1),
+    'hull_from_vertices': (lambda points: simple_polygon_over_points(as_list(points)), hull_from_vertices, 1),
+}
+
+
+def measure(algorithm: str, points: np.ndarray, trace_memory: bool) -> dict:
+
+    prepare, function, _ = ALGORITHMS[algorithm]
+
+    vertices = prepare(points)
+    start = time.perf_counter()
+    hull = function(vertices)
+    seconds = time.perf_counter() - start
+
+    result = {'seconds': seconds, 'hull_size': len(hull), 'peak_bytes': None}
+
+    if trace_memory:
+
+        # a separate run, tracing slows the pure Python algorithms down considerably
+        vertices = prepare(points)
+        tracemalloc.start()
+        function(vertices)
+        result['peak_bytes'] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    return result
+
+
+def run(algorithms: list, distributions: list, sizes: list, budget: float, seed: int,
+        trace_memory: bool = True) -> dict:
+
+    results = []
+
+    for distribution in distributions:
+        for algorithm in algorithms:
+
+            exponent = ALGORITHMS[algorithm][2]
+            previous = None
+
+            for size in sorted(sizes):
+
+                if previous and previous['seconds'] * (size / previous['size']) ** exponent > budget:
+                    break
+
+                points = DISTRIBUTIONS[distribution](np.random.default_rng(seed), size)
+
+                try:
+                    record = measure(algorithm, points, trace_memory)
+                    record['error'] = None
+
+                except Exception as e:
+                    record = {'seconds': None, 'hull_size': None, 'peak_bytes': None, 'error': repr(e)}
+
+                record.update({'algorithm': algorithm, 'distribution': distribution, 'size': size})
+                results.append(record)
+
+                print('{:>20} {:>16} {:>9} {}'.format(
+                    algorithm, distribution, size,
+                    record['error'] or '{:.4f}s'.format(record['seconds'])), file=sys.stderr)
+
+                if record['error']:
+                    break
+
+                previous = record
+
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'machine': platform.machine(),
+            'seed': seed,
+            'budget': budget,
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'results': results,
+    }
+
+
+def parse_arguments(arguments: list = None) -> argparse.Namespace:
+
+    parser = argparse.ArgumentParser(description='Benchmark of the convex hull algorithms.')
+    parser.add_argument('--algorithms', nargs='+', choices=list(ALGORITHMS), default=list(ALGORITHMS))
+    parser.add_argument('--distributions', nargs='+', choices=list(DISTRIBUTIONS), default=list(DISTRIBUTIONS))
+    parser.add_argument('--sizes', nargs='+', type=int, default=DEFAULT_SIZES)
+    parser.add_argument('--budget', type=float, default=10.0,
+                        help='larger sizes are skipped once their predicted time exceeds this many seconds')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-memory', action='store_true', help='skip the peak memory runs')
+    parser.add_argument('--output', help='JSON file to write, standard output if omitted')
+
+    return parser.parse_args(arguments)
+
+
+if __name__ == '__main__':
+
+    args = parse_arguments()
+    report = run(args.algorithms, args.distributions, args.sizes, args.budget, args.seed, not args.no_memory)
+
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(report, output, indent=2)
+
+    else:
+        json.dump(report, sys.stdout, indent=2)
@@ -0,0 +1,79 @@
+import random
+from timeit import timeit
+
+import numpy as np
+
+from geometry_objects.point import Point
+from geometry_objects.predicates import orient2d
+from geometry_objects.predicates import orientation_many
+from geometry_objects.predicates import set_robust
+
+"""
+    Microbenchmark of the orientation predicate
+
+    Compares the way the scan loops used to call the predicate (building a Point per argument
+    and two more for the differences) with the scalar fast path on raw floats and the bulk form.
+
+    Both the robust (default) and the fast inexact modes of the predicates are measured.
+
+    Run with: python -m benchmarks.bench_orientation
+"""
+
+
+# the predicate as it was implemented before the shared predicates module
+def legacy_orientation(p1: 'Point', p2: 'Point', p3: 'Point') -> int:
+
+    a: Point = Point(p2.x - p1.x, p2.y - p1.y)
+    b: Point = Point(p3.x - p1.x, p3.y - p1.y)
+
+    theta = a.x * b.y - a.y * b.x
+
+    if theta > 0:
+        return 1
+
+    if theta < 0:
+        return -1
+
+    return 0
+
+
+def run(size: int = 100000, repeat: int = 5) -> dict:
+
+    a, b = (0.0, 0.0), (1.0, 1.0)
+    queries = [(random.uniform(-1, 1), random.uniform(-1, 1)) for _ in range(size)]
+    query_array = np.array(queries, dtype=np.float64)
+
+    def legacy():
+        for c in queries:
+            legacy_orientation(Point(*a), Point(*b), Point(*c))
+
+    def scalar():
+        ax, ay = a
+        bx, by = b
+        for cx, cy in queries:
+            orient2d(ax, ay, bx, by, cx, cy)
+
+    def bulk():
+        orientation_many(a, b, query_array)
+
+    results = {}
+
+    for name, function in (('legacy', legacy), ('scalar', scalar), ('bulk', bulk)):
+        results[name] = min(timeit(function, number=1) for _ in range(repeat)) / size * 1e9
+
+    return results
+
+
+if __name__ == '__main__':
+
+    for robust in (True, False):
+
+        set_robust(robust)
+        timings = run()
+
+        print('robust mode' if robust else 'fast mode')
+
+        for name, ns in timings.items():
+            print('{:>8}: {:8.1f} ns per test ({:6.1f}x)'.format(name, ns, timings['legacy'] / ns))
+
+    set_robust(True)
@@ -3,6 +3,8 @@ from math import pi
 from math import sqrt
 
 from data_structures.stack import Stack
+from geometry_objects.angular_order import angular_order
+from geometry_objects.predicates import orient2d
 
 # Time complexities for data structures can be found at https://wiki.python.org/moin/TimeComplexity
 
@@ -28,11 +30,7 @@ def sgn(x: float) -> int:
 
 # returns the orientation of point p3 from segment p1p2
 def orientation(p1: tuple, p2: tuple, p3: tuple) -> int:
-
-    a = (p2[0]-p1[0], p2[1]-p1[1])
-    b = (p3[0]-p1[0], p3[1]-p1[1])
-
-    return sgn(a[0]*b[1] - a[1]*b[0])
+    return orient2d(p1[0], p1[1], p2[0], p2[1], p3[0], p3[1])
 
 
 # Calculates slope of the vector with ending point as the point parameter
@@ -70,12 +68,15 @@ def simple_polygon_over_points(vertices: list, clockwise: bool = False) -> list:
     vertices[0], vertices[start_point_index] = vertices[start_point_index], vertices[0]
     start_point = vertices[0]
 
+    # by the angle of the vectors x -> start_point, then by distance, which is the counter clockwise
+    #   angle of start_point -> x measured from the -x direction
+    others = vertices[1:]
+    ordered = [others[i] for i in angular_order(start_point, others, quarter_turns=2)]
+
     if not clockwise:
-        return [vertices[0]] + sorted(vertices[1:], key=lambda x: (
-            angle_between(x, start_point), distance(x, start_point)))[::-1]
+        return [vertices[0]] + ordered[::-1]
 
-    return [vertices[0]] + sorted(vertices[1:], key=lambda x: (
-        angle_between(x, start_point), distance(x, start_point)))
+    return [vertices[0]] + ordered
 
 
 def get_point_index(vertices, x: bool = False, y: bool = False, max_x: bool = True, max_y: bool = True):
@@ -133,7 +134,7 @@ def get_tangents(hull1: list, hull2: list, i1: int, i2: int) -> tuple:
             i1 = (n1 + i1 - 1) % n1
             found_t = False
 
-        if orientation(hull1[i1], hull2[i2], hull2[(n2 + j2 + 1) % n2]) > 0:
+        if orientation(hull1[i1], hull2[i2], hull2[(i2 + 1) % n2]) > 0:
             i2 = (i2 + 1) % n2
             found_t = False
 
@@ -210,37 +211,26 @@ def hull_from_vertices(vertices: list) -> list:
 """
 
 
+# Both hulls are given in clockwise order with at least 3 corners and hull1 lies entirely to the left of hull2
 def find_convex_union(hull1: list, hull2: list) -> list:
 
     # TODO: maybe find the closest point from one hull to the other, then search for tangents
     h1_max_x = get_point_index(hull1, x=True, max_x=True)
     h2_min_x = get_point_index(hull2, x=True, max_x=False)
 
-    tang1, tang2 = get_tangents(hull1, hull2, h1_max_x, h2_min_x)
-    return hull1[:tang1[0]+1] + hull2[tang2[0]:tang2[1]+1] + hull1[tang1[1]:]
+    # upper tangent hull1[i1] -> hull2[i2], lower tangent hull2[j2] -> hull1[j1]
+    (i1, j1), (i2, j2) = get_tangents(hull1, hull2, h1_max_x, h2_min_x)
 
-    # if hull1[h1_max_x][0] > hull2[h2_max_x][0]:
-    #     hull1, hull2 = hull2, hull1
-    #     h1_max_x, h2_max_x = h2_max_x, h1_max_x
-    #
-    # h2_min_x = get_point_index(hull2, x=True, max_x=False)
-    #
-    # # hull1 is to te hull2's left
-    # if hull1[h1_max_x][0] < hull2[h2_min_x][0]:
-    #     tang1, tang2 = get_tangents(hull1, hull2, h1_max_x, h2_min_x)
-    #     print(tang1, tang2)
-    #     return hull1[:tang1[0]] + hull2[tang2[0]:] + hull2[:tang2[1]+1:-1] + hull1[tang1[1]:]
-    #
-    # h1_max_y = get_point_index(hull1, y=True, max_y=True)
-    # h2_max_y = get_point_index(hull2, y=True, max_y=True)
-    #
-    # if hull1[h1_max_y][1] < hull2[h2_max_y][1]:
-    #     hull1, hull2 = hull2, hull1
-    #     h1_max_y, h2_max_y = h2_max_y, h1_max_y
-    #
-    # h1_min_y = get_point_index(hull1, y=True, max_y=False)
-    # tang1, tang2 = get_tangents(hull1, hull2, h1_min_y, h2_max_y)
-    # return hull1[:tang1[0] + 1] + hull2[tang2[0]:tang2[1] + 1] + hull1[tang1[1]:]
+    return clockwise_chain(hull1, j1, i1) + clockwise_chain(hull2, i2, j2)
+
+
+# vertices of the hull from index start to index end (both included), wrapping around the end of the list
+def clockwise_chain(hull: list, start: int, end: int) -> list:
+
+    if start <= end:
+        return hull[start:end+1]
+
+    return hull[start:] + hull[:end+1]
 
 
 if __name__ == '__main__':
@@ -0,0 +1,278 @@
+from bisect import bisect_left
+from bisect import bisect_right
+from itertools import chain
+
+from geometry_objects.predicates import orient2d
+
+"""
+    Dynamic convex hull supporting point insertion, containment and extreme point queries
+
+    The hull is kept as an upper and a lower chain, each sorted by x. The lower chain is stored
+    mirrored (y -> -y), which turns it into an upper chain, so both use the same code.
+    A chain is a list of blocks of at most 2 * CHAIN_BLOCK_SIZE vertices, found by a binary search
+    over the first x of every block, so a change shifts the vertices of one block and not the whole
+    chain and costs O(log n + CHAIN_BLOCK_SIZE).
+    Every operation locates its position with a binary search, points removed by an insertion
+    are paid for by their own insertion.
+"""
+
+
+CHAIN_BLOCK_SIZE: int = 256
+
+
+class UpperChain:
+
+    def __init__(self):
+
+        # blocks of (x, y) in x order, the x of their vertices and the x of the first vertex of every block
+        self.blocks = []
+        self.keys = []
+        self.firsts = []
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        return chain.from_iterable(self.blocks)
+
+    def first(self) -> tuple:
+        return self.blocks[0][0]
+
+    def last(self) -> tuple:
+        return self.blocks[-1][-1]
+
+    # block which holds x if any vertex does
+    def block_index(self, x: float) -> int:
+        return max(bisect_right(self.firsts, x) - 1, 0)
+
+    # last vertex left of x, vertex at x and first vertex right of x, None where there is none
+    def neighbours(self, x: float) -> tuple:
+
+        blocks = self.blocks
+        b = self.block_index(x)
+        block = blocks[b]
+        i = bisect_left(self.keys[b], x)
+
+        same = block[i] if i < len(block) and block[i][0] == x else None
+        j = i + 1 if same is not None else i
+
+        before = block[i-1] if i > 0 else blocks[b-1][-1] if b > 0 else None
+        after = block[j] if j < len(block) else blocks[b+1][0] if b + 1 < len(blocks) else None
+
+        return before, same, after
+
+    def predecessor(self, x: float) -> tuple:
+        return self.neighbours(x)[0]
+
+    def successor(self, x: float) -> tuple:
+        return self.neighbours(x)[2]
+
+    def add(self, x: float, y: float) -> None:
+
+        self.size += 1
+
+        if not self.blocks:
+            self.blocks.append([(x, y)])
+            self.keys.append([x])
+            self.firsts.append(x)
+            return
+
+        b = self.block_index(x)
+        block, keys = self.blocks[b], self.keys[b]
+        i = bisect_left(keys, x)
+        block.insert(i, (x, y))
+        keys.insert(i, x)
+        self.firsts[b] = keys[0]
+
+        if len(block) > 2 * CHAIN_BLOCK_SIZE:
+            self.split(b)
+
+    def remove(self, x: float) -> None:
+
+        self.size -= 1
+
+        b = self.block_index(x)
+        block, keys = self.blocks[b], self.keys[b]
+        i = bisect_left(keys, x)
+        del block[i], keys[i]
+
+        # small blocks are joined with a neighbour so the number of blocks stays proportional to the size
+        if len(block) < CHAIN_BLOCK_SIZE // 2 and len(self.blocks) > 1:
+
+            b = b if b + 1 < len(self.blocks) else b - 1
+
+            self.blocks[b] += self.blocks[b+1]
+            self.keys[b] += self.keys[b+1]
+            del self.blocks[b+1], self.keys[b+1], self.firsts[b+1]
+
+            self.firsts[b] = self.keys[b][0]
+
+            if len(self.blocks[b]) > 2 * CHAIN_BLOCK_SIZE:
+                self.split(b)
+
+        elif not block:
+            del self.blocks[b], self.keys[b], self.firsts[b]
+
+        else:
+            self.firsts[b] = keys[0]
+
+    def split(self, b: int) -> None:
+
+        block, keys = self.blocks[b], self.keys[b]
+
+        self.blocks[b:b+1] = block[:CHAIN_BLOCK_SIZE], block[CHAIN_BLOCK_SIZE:]
+        self.keys[b:b+1] = keys[:CHAIN_BLOCK_SIZE], keys[CHAIN_BLOCK_SIZE:]
+        self.firsts.insert(b + 1, keys[CHAIN_BLOCK_SIZE])
+
+    # checks if the point is on or below the chain, points outside of its x range are not
+    def covers(self, x: float, y: float) -> bool:
+
+        if not self.size or x < self.first()[0] or x > self.last()[0]:
+            return False
+
+        before, same, after = self.neighbours(x)
+
+        if same is not None:
+            return y <= same[1]
+
+        return orient2d(*before, *after, x, y) <= 0
+
+    def insert(self, x: float, y: float) -> bool:
+
+        before = after = None
+
+        if self.size:
+
+            before, same, after = self.neighbours(x)
+
+            if same is not None:
+
+                if y <= same[1]:
+                    return False
+
+                self.remove(x)
+
+            elif before is not None and after is not None and orient2d(*before, *after, x, y) <= 0:
+                return False
+
+        self.add(x, y)
+
+        # neighbours which are no longer strict right turns are below the new point's edges
+        while after is not None:
+
+            further = self.successor(after[0])
+
+            if further is None or orient2d(x, y, *after, *further) < 0:
+                break
+
+            self.remove(after[0])
+            after = further
+
+        while before is not None:
+
+            further = self.predecessor(before[0])
+
+            if further is None or orient2d(*further, *before, x, y) < 0:
+                break
+
+            self.remove(before[0])
+            before = further
+
+        return True
+
+    # vertex maximizing dx * x + dy * y for dy > 0
+    def extreme(self, dx: float, dy: float) -> tuple:
+
+        blocks = self.blocks
+
+        # the projections of the edges onto the direction decrease along the chain, first the block
+        #   the edges stop increasing in, then the vertex in it
+        lo, hi = 0, len(blocks) - 1
+
+        while lo < hi:
+
+            mid = (lo + hi) // 2
+            (ax, ay), (bx, by) = blocks[mid][-1], blocks[mid+1][0]
+
+            if dx * (bx - ax) + dy * (by - ay) > 0:
+                lo = mid + 1
+
+            else:
+                hi = mid
+
+        block = blocks[lo]
+        lo, hi = 0, len(block) - 1
+
+        while lo < hi:
+
+            mid = (lo + hi) // 2
+
+            if dx * (block[mid+1][0] - block[mid][0]) + dy * (block[mid+1][1] - block[mid][1]) > 0:
+                lo = mid + 1
+
+            else:
+                hi = mid
+
+        return block[lo]
+
+
+class DynamicHull:
+
+    def __init__(self, points: list = ()):
+
+        self.upper = UpperChain()
+        self.lower = UpperChain()
+
+        for p in points:
+            self.insert(p)
+
+    def __len__(self):
+        return len(self.vertices())
+
+    # returns True if the hull changed
+    def insert(self, point: tuple) -> bool:
+
+        x, y = point[0], point[1]
+
+        upper_changed = self.upper.insert(x, y)
+        lower_changed = self.lower.insert(x, -y)
+
+        return upper_changed or lower_changed
+
+    # points on the boundary are contained
+    def contains(self, point: tuple) -> bool:
+
+        x, y = point[0], point[1]
+        return self.upper.covers(x, y) and self.lower.covers(x, -y)
+
+    # hull vertex farthest in the given direction
+    def extreme_point(self, direction: tuple) -> tuple:
+
+        dx, dy = direction[0], direction[1]
+
+        if not len(self.upper):
+            raise IndexError('extreme point of an empty hull')
+
+        if dy > 0 or (dy == 0 and dx > 0):
+            return self.upper.extreme(dx, dy) if dy > 0 else self.upper.last()
+
+        if dy == 0 and dx == 0:
+            raise ValueError('direction must not be the zero vector')
+
+        x, y = self.lower.extreme(dx, -dy) if dy < 0 else self.lower.first()
+        return x, -y
+
+    # hull corners in counter clockwise order, starting from the lexicographically smallest point
+    def vertices(self) -> list:
+
+        lower = [(x, -y) for x, y in self.lower]
+        upper = list(self.upper)[::-1]
+
+        if upper and upper[0] == lower[-1]:
+            upper = upper[1:]
+
+        if upper and upper[-1] == lower[0]:
+            upper = upper[:-1]
+
+        return lower + upper
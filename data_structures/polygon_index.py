@@ -0,0 +1,187 @@
+import numpy as np
+
+from geometry_objects.predicates import orientation_arrays
+
+"""
+    Batch point in polygon queries
+
+    The polygon is preprocessed once and every query takes a whole array of points.
+    A convex polygon is split into a fan of triangles around its first vertex: the triangle of a point
+    is found by a binary search over the fan, done for all points at once, so a query is O(log n).
+    A simple non-convex polygon is cut into horizontal bands, every band knowing the edges crossing it:
+    a point is tested by the crossing number of a ray to +x against the edges of its band only.
+    Both use the exact orientation predicate, points on the boundary are contained (as with Point.in_poly).
+"""
+
+
+# at most this many (point, edge) pairs are evaluated at once in a band
+BAND_BLOCK_SIZE: int = 1 << 20
+
+
+class PolygonIndex:
+
+    # vertices of a simple polygon in either orientation, without repeating the first vertex at the end
+    def __init__(self, vertices: list):
+
+        coords = np.asarray(vertices, dtype=np.float64).reshape(-1, 2)
+
+        # consecutive duplicates (a closing copy of the first vertex included) do not change the polygon
+        if len(coords):
+            keep = np.any(coords != np.roll(coords, 1, axis=0), axis=1)
+            coords = coords[keep] if keep.any() else coords[:1]
+
+        x, y = coords[:, 0], coords[:, 1]
+        area = 0.5 * float(np.dot(x, np.roll(y, -1)) - np.dot(np.roll(x, -1), y))
+
+        if len(coords) < 3 or area == 0:
+            raise ValueError('polygon must have at least 3 vertices and a non-zero area')
+
+        coords = coords if area > 0 else coords[::-1]
+
+        self.vertices = np.ascontiguousarray(coords)
+        self.convex = is_convex_fan(self.vertices)
+
+        if self.convex:
+            # without the vertices in the middle of an edge no fan triangle is flat
+            turns = orientation_arrays(np.roll(coords, 1, axis=0), coords, np.roll(coords, -1, axis=0))
+            self.fan = np.ascontiguousarray(coords[turns > 0])
+
+        else:
+            self.build_bands()
+
+    def __len__(self):
+        return len(self.vertices)
+
+    # boolean array telling for every point of an (N, 2) array whether it is in the polygon
+    def contains(self, points) -> np.ndarray:
+
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+
+        if self.convex:
+            return self.contains_convex(points)
+
+        return self.contains_banded(points)
+
+    def contains_convex(self, points: np.ndarray) -> np.ndarray:
+
+        v = self.fan
+        n = len(v)
+
+        inside = (orientation_arrays(v[0], v[1], points) >= 0) & (orientation_arrays(v[0], v[n-1], points) <= 0)
+
+        candidates = np.flatnonzero(inside)
+        p = points[candidates]
+
+        # last fan vertex v[lo] with p not clockwise from it, the triangle v[0], v[lo], v[lo+1] holds p
+        lo = np.ones(len(p), dtype=np.intp)
+        hi = np.full(len(p), n - 1, dtype=np.intp)
+
+        while True:
+
+            active = hi - lo > 1
+
+            if not active.any():
+                break
+
+            mid = (lo + hi) // 2
+            left = orientation_arrays(v[0], v[mid], p) >= 0
+
+            lo = np.where(active & left, mid, lo)
+            hi = np.where(active & ~left, mid, hi)
+
+        inside[candidates] = orientation_arrays(v[lo], v[lo + 1], p) >= 0
+
+        return inside
+
+    def build_bands(self):
+
+        v = self.vertices
+        a, b = v, np.roll(v, -1, axis=0)
+
+        self.edge_start, self.edge_end = a, b
+        self.y_min, self.y_max = float(v[:, 1].min()), float(v[:, 1].max())
+        self.band_count = int(min(max(len(v), 1), 4096))
+
+        low = self.band_of(np.minimum(a[:, 1], b[:, 1]))
+        high = self.band_of(np.maximum(a[:, 1], b[:, 1]))
+
+        # compressed rows: the edges of band k are band_edges[band_offsets[k]:band_offsets[k+1]]
+        spans = high - low + 1
+        edges = np.repeat(np.arange(len(v)), spans)
+        bands = np.repeat(low, spans) + (np.arange(len(edges)) - np.repeat(np.cumsum(spans) - spans, spans))
+
+        order = np.argsort(bands, kind='stable')
+        self.band_edges = edges[order]
+        self.band_offsets = np.concatenate(([0], np.cumsum(np.bincount(bands, minlength=self.band_count))))
+
+    # index of the band of every y, monotone in y so an edge is registered in the band of every y it spans
+    def band_of(self, ys: np.ndarray) -> np.ndarray:
+
+        height = (self.y_max - self.y_min) / self.band_count
+        bands = np.floor((ys - self.y_min) / height).astype(np.intp)
+
+        return np.clip(bands, 0, self.band_count - 1)
+
+    def contains_banded(self, points: np.ndarray) -> np.ndarray:
+
+        inside = np.zeros(len(points), dtype=bool)
+        in_range = np.flatnonzero((points[:, 1] >= self.y_min) & (points[:, 1] <= self.y_max))
+
+        if not len(in_range):
+            return inside
+
+        bands = self.band_of(points[in_range, 1])
+        order = np.argsort(bands, kind='stable')
+        queries, bands = in_range[order], bands[order]
+
+        starts = np.flatnonzero(np.r_[True, bands[1:] != bands[:-1]])
+        ends = np.r_[starts[1:], len(bands)]
+
+        for start, end in zip(starts.tolist(), ends.tolist()):
+
+            band = int(bands[start])
+            edges = self.band_edges[self.band_offsets[band]:self.band_offsets[band+1]]
+            block = max(1, BAND_BLOCK_SIZE // max(len(edges), 1))
+
+            for i in range(start, end, block):
+                indices = queries[i:min(i + block, end)]
+                inside[indices] = self.crossing_test(points[indices], edges)
+
+        return inside
+
+    # odd number of crossings of the ray to +x, or on an edge
+    def crossing_test(self, points: np.ndarray, edges: np.ndarray) -> np.ndarray:
+
+        a = self.edge_start[edges][np.newaxis, :, :]
+        b = self.edge_end[edges][np.newaxis, :, :]
+        p = points[:, np.newaxis, :]
+
+        ori = orientation_arrays(a, b, p)
+
+        px, py = p[..., 0], p[..., 1]
+        ay, by = a[..., 1], b[..., 1]
+
+        on_edge = (ori == 0) & \
+            (np.minimum(a[..., 0], b[..., 0]) <= px) & (px <= np.maximum(a[..., 0], b[..., 0])) & \
+            (np.minimum(ay, by) <= py) & (py <= np.maximum(ay, by))
+
+        # half open in y so a ray through a vertex counts it once, the edge is right of p
+        crosses = ((ay > py) != (by > py)) & ((ori > 0) == (ay < by)) & (ori != 0)
+
+        return on_edge.any(axis=1) | (np.count_nonzero(crosses, axis=1) % 2 == 1)
+
+
+# checks if a counter clockwise polygon is convex: no right turns and the vertices winding around once
+def is_convex_fan(vertices: np.ndarray) -> bool:
+
+    previous = np.roll(vertices, 1, axis=0)
+    following = np.roll(vertices, -1, axis=0)
+
+    if (orientation_arrays(previous, vertices, following) < 0).any():
+        return False
+
+    # the angles of the vertices around the lexicographically smallest one, a strict corner, increase
+    first = int(np.lexsort((vertices[:, 1], vertices[:, 0]))[0])
+    vertices = np.roll(vertices, -first, axis=0)
+
+    return bool((orientation_arrays(vertices[0], vertices[1:-1], vertices[2:]) >= 0).all())
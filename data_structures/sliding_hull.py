@@ -0,0 +1,442 @@
+from bisect import bisect_left
+from bisect import insort
+from collections import deque
+from fractions import Fraction
+
+from geometry_objects.predicates import orient2d
+
+"""
+    Convex hull of a sliding window of points
+
+    The window is a queue: new points are pushed at its head and the oldest ones are popped at its tail.
+    The hull is kept by a balanced (AVL) tree over the distinct x coordinates of the window, leaves being
+    the x coordinates with the highest and the lowest y among the points there. Every inner node stores
+    the bridge of its two subtrees, the edge joining the upper hulls of the points left and right of its
+    split, and the same for the lower hulls (mirrored, y -> -y, so both use the same code). The upper
+    hull of a node is the upper hull of its left subtree up to the bridge followed by the upper hull of
+    its right subtree from the bridge on.
+    A bridge is found by walking down both subtrees at once, one level per step, by the case analysis of
+    Overmars and van Leeuwen, so it costs O(log n) and push and pop, which recompute the bridges along a
+    path of the tree, cost O(log^2 n). A bridge is only recomputed while the changed point is a vertex
+    of the hull below it, which for points inside the hull stops a few levels above the leaf.
+    current_hull walks the bridges in O(h log n).
+
+    Hulls are lists of the given points in clockwise order without collinear ones. A point is a tuple
+    (x, y, ...), anything after the coordinates (a time stamp, an id) is carried along. Of points with
+    the same coordinates the oldest one stands for all of them.
+"""
+
+
+UPPER: int = 0
+LOWER: int = 1
+
+# changes of the hulls of a subtree, see repair
+ADDED: tuple = ((False, True), (False, True))
+REMOVED: tuple = ((True, False), (True, False))
+ROTATED: tuple = ((True, True), (True, True))
+
+# error bound of the float evaluation in below_at relative to x_max^2 y_max, far above the rounding error
+BELOW_AT_ERROR: float = 1e-12
+
+
+class HullNode:
+
+    __slots__ = ('left', 'right', 'height', 'lo', 'hi', 'bridges')
+
+    # a leaf for the points at x, top being the highest y there and bottom the lowest,
+    #   an inner node gets its fields from update
+    def __init__(self, x: float = None, top: float = None, bottom: float = None):
+
+        self.left = self.right = None
+        self.height = 1
+        self.lo = self.hi = x
+        self.bridges = None
+
+        if x is not None:
+            self.set_ys(top, bottom)
+
+    # bridges of a leaf are the leaf itself, on the upper and the mirrored lower hull
+    def set_ys(self, top: float, bottom: float) -> None:
+
+        upper, lower = (self.lo, top), (self.lo, -bottom)
+        self.bridges = ((self, self, upper, upper), (self, self, lower, lower))
+
+
+class SlidingHull:
+
+    def __init__(self, points: list = ()):
+
+        self.window = deque()
+
+        # coordinates -> the points there in window order, x -> the sorted distinct y at x
+        self.points = {}
+        self.columns = {}
+
+        self.root = None
+
+        for p in points:
+            self.push(p)
+
+    def __len__(self):
+        return len(self.window)
+
+    # adds the newest point
+    def push(self, point: tuple) -> None:
+
+        x, y = point[0], point[1]
+        self.window.append(point)
+
+        same = self.points.get((x, y))
+
+        if same is not None:
+            same.append(point)
+            return
+
+        self.points[(x, y)] = deque([point])
+        column = self.columns.get(x)
+
+        if column is None:
+            self.columns[x] = [y]
+            self.root, _ = insert(self.root, HullNode(x, y, y))
+            return
+
+        insort(column, y)
+
+        if y == column[0] or y == column[-1]:
+            self.root, _ = refresh(self.root, x, column[-1], column[0])
+
+    # removes and returns the oldest point
+    def pop(self) -> tuple:
+
+        if not self.window:
+            raise IndexError('pop from an empty window')
+
+        point = self.window.popleft()
+        x, y = point[0], point[1]
+
+        same = self.points[(x, y)]
+        same.popleft()
+
+        if same:
+            return point
+
+        del self.points[(x, y)]
+        column = self.columns[x]
+
+        if len(column) == 1:
+            del self.columns[x]
+            self.root, _ = delete(self.root, x)
+            return point
+
+        del column[bisect_left(column, y)]
+
+        if y < column[0] or y > column[-1]:
+            self.root, _ = refresh(self.root, x, column[-1], column[0])
+
+        return point
+
+    def oldest(self) -> tuple:
+
+        if not self.window:
+            raise IndexError('oldest of an empty window')
+
+        return self.window[0]
+
+    # pops the oldest points as long as condition holds for them (e.g. their time stamp is too old),
+    #   returns the number of points removed
+    def expire(self, condition) -> int:
+
+        removed = 0
+
+        while self.window and condition(self.window[0]):
+            self.pop()
+            removed += 1
+
+        return removed
+
+    # hull of the points in the window, in clockwise order from the lexicographically smallest point
+    def current_hull(self) -> list:
+
+        if self.root is None:
+            return []
+
+        upper, lower = [], []
+        collect(self.root, UPPER, self.root.lo, self.root.hi, upper)
+        collect(self.root, LOWER, self.root.lo, self.root.hi, lower)
+
+        upper = [(x, y) for x, y in upper]
+        lower = [(x, -y) for x, y in lower]
+
+        # from the bottom of the leftmost column up and over the upper hull, then back along the lower hull
+        hull = lower[:1] + (upper if upper[0] != lower[0] else upper[1:])
+        back = lower[:0:-1]
+
+        if back and back[0] == hull[-1]:
+            back = back[1:]
+
+        return [self.points[p][0] for p in hull + back]
+
+
+# recomputes the fields of an inner node from its children
+def update(node: HullNode) -> None:
+
+    node.height = 1 + max(node.left.height, node.right.height)
+    node.lo, node.hi = node.left.lo, node.right.hi
+    node.bridges = (bridge(node, UPPER), bridge(node, LOWER))
+
+
+# Bridge of the upper hulls of the two subtrees, as (left leaf, right leaf, their coordinates)
+#   l and r walk down the left and the right subtree, the hull vertices ab and cd being the bridges of
+#   their own subtrees. Every step drops the half of one subtree the bridge can not end in, collinear
+#   vertices are passed over so the bridge joins the outermost ones.
+def bridge(node: HullNode, side: int) -> tuple:
+
+    l, r = node.left, node.right
+    split = l.hi
+
+    while True:
+
+        l_leaf, r_leaf = l.left is None, r.left is None
+        _, _, a, b = l.bridges[side]
+        _, _, c, d = r.bridges[side]
+
+        if l_leaf and r_leaf:
+            return l, r, a, d
+
+        # c not below the line through ab, the bridge leaves the left hull at a or before it
+        if not l_leaf and orient2d(a[0], a[1], b[0], b[1], c[0], c[1]) >= 0:
+            l = l.left
+
+        # b not below the line through cd, the bridge reaches the right hull at d or after it
+        elif not r_leaf and orient2d(b[0], b[1], c[0], c[1], d[0], d[1]) >= 0:
+            r = r.right
+
+        elif l_leaf:
+            r = r.left
+
+        elif r_leaf:
+            l = l.right
+
+        # the lines through ab and cd cross right of the split if ab is below cd there
+        elif below_at(a, b, c, d, split):
+            r = r.left
+
+        else:
+            l = l.right
+
+
+# checks if the line through ab is below the line through cd at x
+#   The float evaluation is trusted when it is far from 0 relative to the size of its terms, else the
+#   comparison is repeated with fractions.
+def below_at(a: tuple, b: tuple, c: tuple, d: tuple, x: float) -> bool:
+
+    (ax, ay), (bx, by), (cx, cy), (dx, dy) = a, b, c, d
+
+    left = (ay * (bx - ax) + (by - ay) * (x - ax)) * (dx - cx)
+    right = (cy * (dx - cx) + (dy - cy) * (x - cx)) * (bx - ax)
+
+    # every term of the difference is at most 24 x_max^2 y_max in size
+    x_max = max(abs(ax), abs(bx), abs(cx), abs(dx), abs(x))
+    y_max = max(abs(ay), abs(by), abs(cy), abs(dy))
+
+    if abs(left - right) > BELOW_AT_ERROR * x_max * x_max * y_max:
+        return left < right
+
+    (ax, ay), (bx, by), (cx, cy), (dx, dy) = [(Fraction(p[0]), Fraction(p[1])) for p in (a, b, c, d)]
+    x = Fraction(x)
+
+    return (ay * (bx - ax) + (by - ay) * (x - ax)) * (dx - cx) < (cy * (dx - cx) + (dy - cy) * (x - cx)) * (bx - ax)
+
+
+def rotate_left(node: HullNode) -> HullNode:
+
+    right = node.right
+    node.right = right.left
+    update(node)
+
+    right.left = node
+    update(right)
+
+    return right
+
+
+def rotate_right(node: HullNode) -> HullNode:
+
+    left = node.left
+    node.left = left.right
+    update(node)
+
+    left.right = node
+    update(left)
+
+    return left
+
+
+# Fixes an inner node after the leaf at x below it changed, returns the node (or the node rotated in
+#   its place) and the changes of its hulls
+#   changes holds for the upper and the lower hull whether the old and whether the new point of the
+#   leaf is a vertex of the hull of the child. If neither is, the hull of the child and so the bridge
+#   are the same as before.
+def repair(node: HullNode, x: float, went_left: bool, changes: tuple) -> tuple:
+
+    left, right = node.left, node.right
+    node.height = 1 + max(left.height, right.height)
+    node.lo, node.hi = left.lo, right.hi
+
+    if abs(left.height - right.height) > 1:
+
+        # a rotation keeps the points of the subtree, so its old hull is the one of the bridges before
+        olds = [old and on_part(node.bridges[side], x, went_left) for side, (old, _) in enumerate(changes)]
+
+        if left.height > right.height:
+
+            if left.left.height < left.right.height:
+                node.left = rotate_left(left)
+
+            node = rotate_right(node)
+
+        else:
+
+            if right.right.height < right.left.height:
+                node.right = rotate_right(right)
+
+            node = rotate_left(node)
+
+        return node, tuple((olds[side], new and on_hull(node, side, x)) for side, (_, new) in enumerate(changes))
+
+    bridges = list(node.bridges)
+    result = []
+
+    for side, (old, new) in enumerate(changes):
+
+        if old or new:
+
+            old = old and on_part(node.bridges[side], x, went_left)
+            bridges[side] = bridge(node, side)
+            new = new and on_part(bridges[side], x, went_left)
+
+        result.append((old, new))
+
+    node.bridges = tuple(bridges)
+
+    return node, tuple(result)
+
+
+# checks if a vertex at x of the hull of the left (or right) child is kept by the bridge
+def on_part(edge: tuple, x: float, went_left: bool) -> bool:
+    return x <= edge[0].lo if went_left else x >= edge[1].lo
+
+
+# checks if the leaf at x is a vertex of the hull of the subtree, the bridges on its path keeping it
+def on_hull(node: HullNode, side: int, x: float) -> bool:
+
+    while node.left is not None:
+
+        went_left = x <= node.left.hi
+
+        if not on_part(node.bridges[side], x, went_left):
+            return False
+
+        node = node.left if went_left else node.right
+
+    return node.lo == x
+
+
+# subtree with the leaf added, its x is not in the subtree yet
+def insert(node: HullNode, leaf: HullNode) -> tuple:
+
+    if node is None:
+        return leaf, ADDED
+
+    if node.left is None:
+
+        parent = HullNode()
+        parent.left, parent.right = (node, leaf) if node.lo < leaf.lo else (leaf, node)
+        update(parent)
+
+        return parent, ADDED
+
+    went_left = leaf.lo <= node.left.hi
+
+    if went_left:
+        node.left, changes = insert(node.left, leaf)
+
+    else:
+        node.right, changes = insert(node.right, leaf)
+
+    return repair(node, leaf.lo, went_left, changes)
+
+
+# subtree without the leaf at x
+def delete(node: HullNode, x: float) -> tuple:
+
+    if node.left is None:
+        return None, REMOVED
+
+    went_left = x <= node.left.hi
+
+    # the leaf is a vertex of both hulls of its parent, which the sibling replaces
+    if went_left and node.left.left is None:
+        return node.right, REMOVED
+
+    if not went_left and node.right.left is None:
+        return node.left, REMOVED
+
+    if went_left:
+        node.left, changes = delete(node.left, x)
+
+    else:
+        node.right, changes = delete(node.right, x)
+
+    return repair(node, x, went_left, changes)
+
+
+# subtree with new highest and lowest y at x, a changed y is both removed and added
+def refresh(node: HullNode, x: float, top: float, bottom: float) -> tuple:
+
+    if node.left is None:
+
+        moved_top = node.bridges[UPPER][2][1] != top
+        moved_bottom = node.bridges[LOWER][2][1] != -bottom
+        node.set_ys(top, bottom)
+
+        return node, ((moved_top, moved_top), (moved_bottom, moved_bottom))
+
+    went_left = x <= node.left.hi
+
+    if went_left:
+        node.left, changes = refresh(node.left, x, top, bottom)
+
+    else:
+        node.right, changes = refresh(node.right, x, top, bottom)
+
+    return repair(node, x, went_left, changes)
+
+
+# appends the vertices of the hull of the subtree with x in [lo, hi] to out, from left to right
+def collect(node: HullNode, side: int, lo: float, hi: float, out: list) -> None:
+
+    if lo > hi or hi < node.lo or lo > node.hi:
+        return
+
+    if node.left is None:
+        out.append(node.bridges[side][2])
+        return
+
+    p, q = node.bridges[side][:2]
+
+    collect(node.left, side, lo, min(hi, p.lo), out)
+    collect(node.right, side, max(lo, q.lo), hi, out)
+
+
+if __name__ == '__main__':
+
+    track = [(0, 0, 0), (2, 1, 1), (4, 0, 2), (5, 3, 3), (3, 5, 4), (6, 6, 5), (8, 5, 6)]
+    window = SlidingHull()
+
+    for p in track:
+
+        window.push(p)
+        window.expire(lambda q: q[2] <= p[2] - 4)
+
+        print('time: ', p[2], 'hull: ', window.current_hull())
@@ -0,0 +1,327 @@
+from heapq import heappop
+from heapq import heappush
+from math import ceil
+from math import sqrt
+
+import numpy as np
+
+from geometry_objects.point import Point
+from geometry_objects.vector import Vector
+
+"""
+    Broad phase spatial indexes over axis aligned bounding boxes
+
+    Both indexes store the bounds (min x, min y, max x, max y) of Vectors, polygons or points and
+    return candidate indices for the exact tests (Vector.do_intersect, Point.in_triangle, Point.in_poly).
+    Boxes touching each other overlap, so touching segments are never pruned.
+
+    STRTree is an R-tree bulk loaded with Sort-Tile-Recursive packing: the leaves are sorted into vertical
+    slabs by x and every slab by y, then every node groups node_capacity consecutive nodes of the level
+    below. UniformGrid registers every box in the cells of a regular grid it overlaps, it suits boxes of
+    similar size spread evenly and answers nearest queries by searching rings of cells.
+"""
+
+
+def coordinates(point) -> tuple:
+
+    if isinstance(point, Point):
+        return point.x, point.y
+
+    return point[0], point[1]
+
+
+# bounds of a Vector, a polygon (list of points) or a single point
+def bounds_of(item) -> tuple:
+
+    if isinstance(item, Vector):
+        return item.bounds
+
+    if isinstance(item, Point) or (len(item) == 2 and np.isscalar(item[0])):
+        points = [coordinates(item)]
+
+    else:
+        points = [coordinates(p) for p in item]
+
+    xs, ys = [p[0] for p in points], [p[1] for p in points]
+
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+# (N, 4) array of the bounds of the items, an (N, 4) array is taken as bounds already
+def bounds_array(items) -> np.ndarray:
+
+    if isinstance(items, np.ndarray):
+        return np.ascontiguousarray(items, dtype=np.float64).reshape(-1, 4)
+
+    return np.array([bounds_of(item) for item in items], dtype=np.float64).reshape(-1, 4)
+
+
+# boolean array of the boxes overlapping the box, boxes touching it included
+def overlaps(boxes: np.ndarray, box) -> np.ndarray:
+    return (boxes[..., 0] <= box[..., 2]) & (box[..., 0] <= boxes[..., 2]) & \
+        (boxes[..., 1] <= box[..., 3]) & (box[..., 1] <= boxes[..., 3])
+
+
+# squared distances from the point to the boxes, 0 inside of a box
+def box_distances(boxes: np.ndarray, x: float, y: float) -> np.ndarray:
+
+    dx = np.maximum(np.maximum(boxes[:, 0] - x, x - boxes[:, 2]), 0.0)
+    dy = np.maximum(np.maximum(boxes[:, 1] - y, y - boxes[:, 3]), 0.0)
+
+    return dx * dx + dy * dy
+
+
+# concatenation of the ranges [starts[i], ends[i]) and the index of the range of every element
+def expand_ranges(starts: np.ndarray, ends: np.ndarray) -> tuple:
+
+    lengths = ends - starts
+    owners = np.repeat(np.arange(len(starts)), lengths)
+    firsts = np.cumsum(lengths) - lengths
+
+    return np.repeat(starts, lengths) + (np.arange(len(owners)) - firsts[owners]), owners
+
+
+class STRTree:
+
+    def __init__(self, items, node_capacity: int = 16):
+
+        if node_capacity < 2:
+            raise ValueError('node_capacity must be at least 2')
+
+        bounds = bounds_array(items)
+
+        self.node_capacity = node_capacity
+        self.order = str_order(bounds, node_capacity)
+
+        # levels[0] are the item bounds in leaf order, levels[-1] the root level
+        self.levels = [bounds[self.order]]
+
+        while len(self.levels[-1]) > 1:
+
+            below = self.levels[-1]
+            starts = np.arange(0, len(below), node_capacity)
+
+            self.levels.append(np.column_stack((
+                np.minimum.reduceat(below[:, 0], starts), np.minimum.reduceat(below[:, 1], starts),
+                np.maximum.reduceat(below[:, 2], starts), np.maximum.reduceat(below[:, 3], starts))))
+
+    def __len__(self):
+        return len(self.order)
+
+    def children(self, level: int, nodes: np.ndarray) -> tuple:
+
+        starts = nodes * self.node_capacity
+        ends = np.minimum(starts + self.node_capacity, len(self.levels[level-1]))
+
+        return expand_ranges(starts, ends)
+
+    # sorted indices of the items whose bounds overlap the box (min x, min y, max x, max y)
+    def query(self, box) -> np.ndarray:
+
+        queries, items = self.query_many(np.asarray(box, dtype=np.float64).reshape(1, 4))
+        return np.sort(items)
+
+    # (query index, item index) pairs for an (Q, 4) array of boxes, all queries descend the tree together
+    def query_many(self, boxes) -> tuple:
+
+        boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+
+        if not len(self.order):
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+
+        top = len(self.levels) - 1
+        queries = np.arange(len(boxes))
+        nodes = np.zeros(len(boxes), dtype=np.intp)
+
+        for level in range(top, -1, -1):
+
+            hit = overlaps(self.levels[level][nodes], boxes[queries])
+            queries, nodes = queries[hit], nodes[hit]
+
+            if level:
+                nodes, owners = self.children(level, nodes)
+                queries = queries[owners]
+
+        return queries, self.order[nodes]
+
+    # indices of the k items with the nearest bounds to the point, nearest first
+    def nearest(self, point, k: int = 1) -> list:
+
+        x, y = coordinates(point)
+        result = []
+
+        if not len(self.order):
+            return result
+
+        top = len(self.levels) - 1
+        heap = [(float(box_distances(self.levels[top], x, y)[0]), top, 0)]
+
+        # best first: a popped leaf is nearer than anything still in the heap
+        while heap and len(result) < k:
+
+            distance, level, node = heappop(heap)
+
+            if not level:
+                result.append(int(self.order[node]))
+                continue
+
+            children, _ = self.children(level, np.array([node]))
+            distances = box_distances(self.levels[level-1][children], x, y)
+
+            for child, d in zip(children.tolist(), distances.tolist()):
+                heappush(heap, (d, level - 1, child))
+
+        return result
+
+    # (Q, k) array of the indices of the k nearest items to every point of an (Q, 2) array
+    def nearest_many(self, points, k: int = 1) -> np.ndarray:
+
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        return np.array([self.nearest(p, k) for p in points.tolist()], dtype=np.intp).reshape(len(points), -1)
+
+
+# leaf order of the Sort-Tile-Recursive packing
+def str_order(bounds: np.ndarray, node_capacity: int) -> np.ndarray:
+
+    size = len(bounds)
+    centers_x = bounds[:, 0] + bounds[:, 2]
+    centers_y = bounds[:, 1] + bounds[:, 3]
+
+    leaves = ceil(size / node_capacity)
+    slab_size = ceil(sqrt(leaves)) * node_capacity
+
+    by_x = np.argsort(centers_x, kind='stable')
+    slabs = np.arange(size) // max(slab_size, 1)
+
+    # x sorted slabs, each sorted by y
+    return by_x[np.lexsort((centers_y[by_x], slabs))]
+
+
+class UniformGrid:
+
+    # a default cell has about the area per box of the total bounds, but is not smaller than an average box
+    def __init__(self, items, cell_size: float = None):
+
+        bounds = bounds_array(items)
+        self.bounds = bounds
+
+        if len(bounds):
+            self.x0, self.y0 = float(bounds[:, 0].min()), float(bounds[:, 1].min())
+            width, height = float(bounds[:, 2].max()) - self.x0, float(bounds[:, 3].max()) - self.y0
+        else:
+            self.x0 = self.y0 = width = height = 0.0
+
+        if cell_size is None:
+            extent = float(np.mean(np.maximum(bounds[:, 2] - bounds[:, 0], bounds[:, 3] - bounds[:, 1]))) \
+                if len(bounds) else 0.0
+            cell_size = max(sqrt(width * height / max(len(bounds), 1)), extent)
+
+        if not cell_size > 0:
+            cell_size = max(width, height, 1.0)
+
+        self.cell_size = float(cell_size)
+        self.nx = int(width // self.cell_size) + 1
+        self.ny = int(height // self.cell_size) + 1
+
+        ix0, iy0 = self.cell_of(bounds[:, 0], bounds[:, 1])
+        ix1, iy1 = self.cell_of(bounds[:, 2], bounds[:, 3])
+
+        # every box is registered in every cell of its range of columns and rows
+        columns, items = expand_ranges(ix0, ix1 + 1)
+        rows, owners = expand_ranges(iy0[items], iy1[items] + 1)
+        columns, items = columns[owners], items[owners]
+
+        cells = rows * self.nx + columns
+        order = np.argsort(cells, kind='stable')
+
+        # compressed rows: the boxes of cell c are cell_items[cell_offsets[c]:cell_offsets[c+1]]
+        self.cell_items = items[order]
+        self.cell_offsets = np.concatenate(([0], np.cumsum(np.bincount(cells, minlength=self.nx * self.ny))))
+
+    def __len__(self):
+        return len(self.bounds)
+
+    # column and row of the cells of the coordinates, clipped to the grid
+    def cell_of(self, xs, ys) -> tuple:
+
+        ix = np.clip(np.floor((np.asarray(xs) - self.x0) / self.cell_size), 0, self.nx - 1).astype(np.intp)
+        iy = np.clip(np.floor((np.asarray(ys) - self.y0) / self.cell_size), 0, self.ny - 1).astype(np.intp)
+
+        return ix, iy
+
+    # items registered in the cells of the given columns and rows, with repetitions
+    def items_in(self, ix0: int, iy0: int, ix1: int, iy1: int) -> np.ndarray:
+
+        rows = np.arange(iy0, iy1 + 1)
+        starts = self.cell_offsets[rows * self.nx + ix0]
+        ends = self.cell_offsets[rows * self.nx + ix1 + 1]
+
+        return self.cell_items[expand_ranges(starts, ends)[0]]
+
+    # sorted indices of the items whose bounds overlap the box (min x, min y, max x, max y)
+    def query(self, box) -> np.ndarray:
+
+        box = np.asarray(box, dtype=np.float64).reshape(4)
+
+        if not len(self.bounds):
+            return np.empty(0, dtype=np.intp)
+
+        (ix0, ix1), (iy0, iy1) = self.cell_of(box[[0, 2]], box[[1, 3]])
+        candidates = np.unique(self.items_in(int(ix0), int(iy0), int(ix1), int(iy1)))
+
+        return candidates[overlaps(self.bounds[candidates], box)]
+
+    # (query index, item index) pairs for an (Q, 4) array of boxes
+    def query_many(self, boxes) -> tuple:
+
+        boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+        found = [self.query(box) for box in boxes]
+
+        queries = np.repeat(np.arange(len(boxes)), [len(f) for f in found])
+        items = np.concatenate(found) if found else np.empty(0, dtype=np.intp)
+
+        return queries, items.astype(np.intp)
+
+    # indices of the k items with the nearest bounds to the point, nearest first
+    def nearest(self, point, k: int = 1) -> list:
+
+        x, y = coordinates(point)
+
+        if not len(self.bounds):
+            return []
+
+        (cx,), (cy,) = self.cell_of([x], [y])
+        seen = np.empty(0, dtype=np.intp)
+        ring = 0
+
+        # rings of cells around the cell of the point until no unseen box can be nearer than the k-th
+        while True:
+
+            ix0, iy0 = max(cx - ring, 0), max(cy - ring, 0)
+            ix1, iy1 = min(cx + ring, self.nx - 1), min(cy + ring, self.ny - 1)
+
+            seen = np.union1d(seen, self.items_in(ix0, iy0, ix1, iy1))
+            distances = box_distances(self.bounds[seen], x, y)
+
+            covered = ix0 == 0 and iy0 == 0 and ix1 == self.nx - 1 and iy1 == self.ny - 1
+
+            # the distance from the point to the cells outside the searched square
+            margin = max(0.0, min(
+                x - (self.x0 + ix0 * self.cell_size) if ix0 > 0 else np.inf,
+                self.x0 + (ix1 + 1) * self.cell_size - x if ix1 < self.nx - 1 else np.inf,
+                y - (self.y0 + iy0 * self.cell_size) if iy0 > 0 else np.inf,
+                self.y0 + (iy1 + 1) * self.cell_size - y if iy1 < self.ny - 1 else np.inf))
+
+            if covered or (len(seen) >= k and np.partition(distances, k - 1)[k-1] <= margin * margin):
+                break
+
+            ring += 1
+
+        order = np.lexsort((seen, distances))[:k]
+        return seen[order].tolist()
+
+    # (Q, k) array of the indices of the k nearest items to every point of an (Q, 2) array
+    def nearest_many(self, points, k: int = 1) -> np.ndarray:
+
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        return np.array([self.nearest(p, k) for p in points.tolist()], dtype=np.intp).reshape(len(points), -1)
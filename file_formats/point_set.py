@@ -0,0 +1,180 @@
+import mmap
+import struct
+import sys
+
+import numpy as np
+
+from geometry_objects.point_array import PointArray
+
+"""
+    Binary point set format
+
+    A 64 byte little endian header followed by the contiguous float64 (x, y) pairs of all points and,
+    optionally, an int64 offset table splitting the points into polygons (polygon i is made of the
+    points offsets[i]:offsets[i+1]).
+
+    header: magic b'CGPS', version (u16), flags (u16), point count (u64), polygon count (u64),
+            byte position of the points (u64), byte position of the offsets or 0 (u64), padding
+
+    The point data is 8 byte aligned, so it can be mapped straight into numpy arrays or a PointArray.
+"""
+
+
+MAGIC: bytes = b'CGPS'
+VERSION: int = 1
+HEADER = struct.Struct('<4sHHQQQQ')
+HEADER_SIZE: int = 64
+
+FLAG_OFFSETS: int = 1
+
+
+def write_point_set(path: str, points, offsets=None) -> None:
+
+    points = np.ascontiguousarray(points, dtype='<f8')
+
+    if points.ndim != 2 or points.shape[1] != 2:
+        raise ValueError('Points must be given as an (N, 2) array.')
+
+    points_position = HEADER_SIZE
+    offsets_position = 0
+    polygon_count = 0
+    flags = 0
+
+    if offsets is not None:
+
+        offsets = np.ascontiguousarray(offsets, dtype='<i8')
+
+        if offsets.ndim != 1 or len(offsets) == 0 or offsets[0] != 0 or offsets[-1] != len(points) \
+                or np.any(np.diff(offsets) < 0):
+            raise ValueError('Offsets must be a non decreasing vector running from 0 to the number of points.')
+
+        offsets_position = points_position + points.nbytes
+        polygon_count = len(offsets) - 1
+        flags |= FLAG_OFFSETS
+
+    header = HEADER.pack(MAGIC, VERSION, flags, len(points), polygon_count, points_position, offsets_position)
+
+    with open(path, 'wb') as file:
+
+        file.write(header.ljust(HEADER_SIZE, b'\0'))
+        points.tofile(file)
+
+        if offsets is not None:
+            offsets.tofile(file)
+
+
+# writes the hull vertices given as indices into points, as returned by convex_hull_monotone_chain
+def write_hull(path: str, points, hull_indices) -> None:
+    write_point_set(path, np.asarray(points, dtype=np.float64)[np.asarray(hull_indices, dtype=np.intp)])
+
+
+# writes a list of polygons (lists of points) as one point set with an offset table
+def write_polygons(path: str, polygons: list) -> None:
+
+    offsets = np.zeros(len(polygons) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(polygon) for polygon in polygons])
+
+    points = np.empty((offsets[-1], 2), dtype=np.float64)
+
+    for i, polygon in enumerate(polygons):
+
+        if len(polygon):
+            points[offsets[i]:offsets[i+1]] = polygon
+
+    write_point_set(path, points, offsets)
+
+
+def read_header(file) -> dict:
+
+    data = file.read(HEADER.size)
+
+    if len(data) < HEADER.size:
+        raise ValueError('File is too short to be a point set.')
+
+    magic, version, flags, point_count, polygon_count, points_position, offsets_position = HEADER.unpack(data)
+
+    if magic != MAGIC:
+        raise ValueError('File is not a point set.')
+
+    if version != VERSION:
+        raise ValueError('Unsupported point set version {}.'.format(version))
+
+    return {
+        'flags': flags,
+        'point_count': point_count,
+        'polygon_count': polygon_count,
+        'points_position': points_position,
+        'offsets_position': offsets_position if flags & FLAG_OFFSETS else 0,
+    }
+
+
+# Maps the file with np.memmap, nothing is read until it is used
+#   Returns the (N, 2) points and the offsets (None if the file has no offset table).
+def load_point_set(path: str, mode: str = 'r') -> tuple:
+
+    with open(path, 'rb') as file:
+        header = read_header(file)
+
+    size = header['point_count']
+
+    if size:
+        points = np.memmap(path, dtype='<f8', mode=mode, offset=header['points_position'], shape=(size, 2))
+
+    else:
+        points = np.empty((0, 2), dtype=np.float64)
+
+    offsets = None
+
+    if header['offsets_position']:
+        offsets = np.memmap(path, dtype='<i8', mode=mode, offset=header['offsets_position'],
+                            shape=(header['polygon_count'] + 1,))
+
+    return points, offsets
+
+
+# Maps the file with mmap and wraps the points in a PointArray without copying them
+#   Returns the PointArray and the offsets as a memoryview of int64 (None if the file has none).
+#   On a big endian machine the points and offsets are read into byteswapped copies instead, unless
+#   zero_copy is set or the mapping has to be writable, which raise ValueError there.
+def load_point_array(path: str, writable: bool = False, zero_copy: bool = False) -> tuple:
+
+    if sys.byteorder != 'little':
+
+        if writable or zero_copy:
+            raise ValueError('Zero copy loading needs a little endian machine, use load_point_set.')
+
+        return copy_point_array(path)
+
+    with open(path, 'r+b' if writable else 'rb') as file:
+
+        header = read_header(file)
+        file.seek(0)
+
+        if not header['point_count'] and not header['offsets_position']:
+            return PointArray(), None
+
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ)
+
+    view = memoryview(mapped)
+    start = header['points_position']
+    points = PointArray.from_buffer(view[start:start + 16 * header['point_count']])
+
+    offsets = None
+
+    if header['offsets_position']:
+        start = header['offsets_position']
+        offsets = view[start:start + 8 * (header['polygon_count'] + 1)].cast('q')
+
+    return points, offsets
+
+
+# PointArray and int64 offsets of the file in native byte order, copied out of load_point_set
+def copy_point_array(path: str) -> tuple:
+
+    points, offsets = load_point_set(path)
+    points = PointArray.from_numpy(np.array(points, dtype=np.float64)) if len(points) else PointArray()
+
+    if offsets is not None:
+        offsets = memoryview(np.array(offsets, dtype=np.int64)).cast('B').cast('q')
+
+    return points, offsets
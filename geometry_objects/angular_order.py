@@ -0,0 +1,138 @@
+from functools import cmp_to_key
+
+import numpy as np
+
+from geometry_objects.predicates import orient2d
+from geometry_objects.predicates import orientation_arrays
+
+"""
+    Angular ordering of points around an origin without trigonometry
+
+    Points are ordered by the counter clockwise angle of the vector origin -> point, then by distance.
+    The points are first sorted by a pseudo angle (a monotone function of the angle computed with one
+    division), then every neighbouring pair is checked with the exact comparator: half-plane first and
+    the orientation predicate within a half-plane. Only if a pair is out of order, which the rounding
+    of the pseudo angle can cause for nearly equal directions, the nearly sorted list is re-sorted
+    with the exact comparator. Directions are compared exactly; distances are compared as squared
+    floats, which is exact on integer coordinates.
+"""
+
+
+# inputs at least this large are sorted with numpy
+ANGULAR_SORT_NUMPY_THRESHOLD: int = 256
+
+
+# monotone in the counter clockwise angle of (dx, dy) from the +x axis, in [0, 4)
+def pseudo_angle(dx: float, dy: float) -> float:
+
+    if dx == 0 and dy == 0:
+        return 0.0
+
+    p = dy / (abs(dx) + abs(dy))
+
+    if dx < 0:
+        return 2.0 - p
+
+    if dy < 0:
+        return 4.0 + p
+
+    return p
+
+
+# 0 for the angles [0, 180) (and the zero vector), 1 for [180, 360)
+def half_plane(dx: float, dy: float) -> int:
+    return 0 if dy > 0 or (dy == 0 and dx >= 0) else 1
+
+
+# rotates the points clockwise by quarter_turns * 90 degrees, which is exact
+def rotate(points: list, quarter_turns: int) -> list:
+
+    quarter_turns %= 4
+
+    if quarter_turns == 0:
+        return points
+
+    if quarter_turns == 1:
+        return [(p[1], -p[0]) for p in points]
+
+    if quarter_turns == 2:
+        return [(-p[0], -p[1]) for p in points]
+
+    return [(-p[1], p[0]) for p in points]
+
+
+def angular_comparator(origin: tuple, points: list):
+
+    ox, oy = origin[0], origin[1]
+
+    def compare(i: int, j: int) -> int:
+
+        ax, ay = points[i]
+        bx, by = points[j]
+
+        ha, hb = half_plane(ax - ox, ay - oy), half_plane(bx - ox, by - oy)
+
+        if ha != hb:
+            return ha - hb
+
+        ori = orient2d(ox, oy, ax, ay, bx, by)
+
+        if ori != 0:
+            return -ori
+
+        da = (ax - ox) ** 2 + (ay - oy) ** 2
+        db = (bx - ox) ** 2 + (by - oy) ** 2
+
+        return (da > db) - (da < db)
+
+    return compare
+
+
+# Indices of the points ordered by angle around origin, then by distance from it (the sort is stable)
+#   Angles are measured counter clockwise from the +x axis turned counter clockwise by quarter_turns * 90
+#   degrees, e.g. quarter_turns=3 starts from the downward direction.
+def angular_order(origin: tuple, points: list, quarter_turns: int = 0) -> list:
+
+    [origin], points = rotate([origin], quarter_turns), rotate(points, quarter_turns)
+    compare = angular_comparator(origin, points)
+
+    if len(points) >= ANGULAR_SORT_NUMPY_THRESHOLD:
+        order, in_order = angular_order_numpy(origin, points)
+
+    else:
+        ox, oy = origin[0], origin[1]
+        keys = [(pseudo_angle(p[0] - ox, p[1] - oy), (p[0] - ox) ** 2 + (p[1] - oy) ** 2) for p in points]
+        order = sorted(range(len(points)), key=keys.__getitem__)
+
+        in_order = all(compare(order[k], order[k+1]) <= 0 for k in range(len(order) - 1))
+
+    if in_order:
+        return order
+
+    # the order is nearly right, which the merge sort finishes in close to linear time
+    return sorted(order, key=cmp_to_key(compare))
+
+
+# returns the pseudo angle order and whether it passed the exact check
+def angular_order_numpy(origin: tuple, points: list) -> tuple:
+
+    coords = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    ox, oy = float(origin[0]), float(origin[1])
+
+    dx, dy = coords[:, 0] - ox, coords[:, 1] - oy
+    spread = np.abs(dx) + np.abs(dy)
+    p = np.divide(dy, spread, out=np.zeros_like(dy), where=spread != 0)
+
+    pseudo = np.where(dx < 0, 2.0 - p, np.where(dy < 0, 4.0 + p, p))
+    distance = dx * dx + dy * dy
+
+    order = np.lexsort((distance, pseudo))
+
+    a, b = order[:-1], order[1:]
+    half = ((dy < 0) | ((dy == 0) & (dx < 0))).astype(np.int8)
+    ori = orientation_arrays((ox, oy), coords[a], coords[b])
+
+    same_half = half[a] == half[b]
+    in_order = (half[a] < half[b]) | (same_half & ((ori > 0) | ((ori == 0) & (distance[a] <= distance[b]))))
+
+    return order.tolist(), bool(in_order.all())
@@ -3,11 +3,16 @@ from math import pi
 from math import sqrt
 from sys import maxsize
 
-from berg_problems.chapter_1 import orientation
+from geometry_objects.predicates import orient2d
 
 
+# Links of a circular doubly linked list
+#   BaseNode declares no slots so it can be mixed into other slotted classes (as Vertex with Point),
+#   the concrete classes declare the next_node and previous_node slots. Node is the plain one.
 class BaseNode:
 
+    __slots__ = ()
+
     def __init__(self):
 
         self.next_node = self
@@ -48,8 +53,15 @@ class BaseNode:
         pom2.previous_node = a
 
 
+class Node(BaseNode):
+
+    __slots__ = ('next_node', 'previous_node')
+
+
 class Point:
 
+    __slots__ = ('x', 'y')
+
     CLASSIFICATIONS = {'between': 0, 'left': -1, 'right': 1, 'head': 2, 'tail': -2, 'front': 3, 'back': -3}
 
     def __init__(self, x: float = 0.0, y: float = 0.0):
@@ -112,17 +124,19 @@ class Point:
 
     def classify(self, p1: 'Point', p2: 'Point'):
 
+        ori = Point.orientation(p1, p2, self)
+
         # if triangle p1, p2, self is negatively oriented, then the self point is on the the left side
-        if Point.orientation(p1, p2, self) < 0:
+        if ori < 0:
             return Point.CLASSIFICATIONS['left']
 
         # if triangle p1, p2, self is positively oriented, then the self point is on the the right side
-        elif Point.orientation(p1, p2, self) > 0:
+        elif ori > 0:
             return Point.CLASSIFICATIONS['right']
 
         # points are collinear in the following code
         # if vectors p1,p2 and p1,p3 are oriented countrary, the point is classified as behind
-        elif (p2 - p1).x * (self - p1).x < 0 or (p2 - p1).y * (self - p1).y < 0:
+        elif (p2.x - p1.x) * (self.x - p1.x) < 0 or (p2.y - p1.y) * (self.y - p1.y) < 0:
             return Point.CLASSIFICATIONS['back']
 
         # if the points x and y values are between ones of the p1 and p2 pointsm point is classified as between
@@ -155,21 +169,10 @@ class Point:
     @staticmethod
     def orientation(p1: 'Point', p2: 'Point', p3: 'Point') -> int:
 
-        a: Point = p2 - p1
-        b: Point = p3 - p1
-
-        theta = a.x * b.y - a.y * b.x
-
-        # oriented counter clockwise (positive) <=> p3 is on the p1p2 left
-        if theta > 0:
-            return 1
-
-        # oriented clockwise (negative) <=> p3 is on the p1p2 right
-        if theta < 0:
-            return -1
-
-        # collinear
-        return 0
+        # 1 <=> oriented counter clockwise <=> p3 is on the p1p2 left
+        # -1 <=> oriented clockwise <=> p3 is on the p1p2 right
+        # 0 <=> collinear
+        return orient2d(p1.x, p1.y, p2.x, p2.y, p3.x, p3.y)
 
     @staticmethod
     def distance(p1: tuple, p2: tuple) -> float:
@@ -187,11 +190,13 @@ class Point:
     def in_poly(self, vertices: list) -> bool:
 
         size: int = len(vertices)
-        point: tuple = (self.x, self.y)
+        x, y = self.x, self.y
 
         for i in range(size):
 
-            if orientation(vertices[i], vertices[(i+1) % size], point) > 0:
+            a, b = vertices[i], vertices[(i+1) % size]
+
+            if orient2d(a[0], a[1], b[0], b[1], x, y) > 0:
                 return False
 
         return True
@@ -199,6 +204,8 @@ class Point:
 
 class Vertex(BaseNode, Point):
 
+    __slots__ = ('next_node', 'previous_node')
+
     def __init__(self, x: float = 0.0, y: float = 0.0):
 
         BaseNode.__init__(self)
@@ -0,0 +1,140 @@
+from array import array
+
+import numpy as np
+
+from geometry_objects.point import Point
+
+"""
+    Contiguous point storage
+
+    Coordinates are kept interleaved (x0, y0, x1, y1, ...) in a single buffer of doubles,
+    which costs 16 bytes per point instead of a full Point object per point.
+"""
+
+
+# Lightweight view of a single point stored in a PointArray
+#   Reads and writes go straight to the buffer of the array, so every Point method
+#   (orientation, classify, in_triangle, ...) works on views without copying coordinates.
+#   The buffer is looked up on the array at every access, so views stay valid when the array grows.
+class PointView(Point):
+
+    __slots__ = ('_owner', '_index')
+
+    def __init__(self, owner: 'PointArray', index: int):
+
+        self._owner = owner
+        self._index = index
+
+    @property
+    def x(self) -> float:
+        return self._owner._coords[2 * self._index]
+
+    @x.setter
+    def x(self, value: float):
+        self._owner._coords[2 * self._index] = value
+
+    @property
+    def y(self) -> float:
+        return self._owner._coords[2 * self._index + 1]
+
+    @y.setter
+    def y(self, value: float):
+        self._owner._coords[2 * self._index + 1] = value
+
+    def index(self) -> int:
+        return self._index
+
+    def copy(self) -> Point:
+        return Point(self.x, self.y)
+
+
+class PointArray:
+
+    def __init__(self, points: list = ()):
+
+        self._storage = array('d')
+
+        for p in points:
+            self._storage.append(p[0])
+            self._storage.append(p[1])
+
+        self._coords = memoryview(self._storage)
+
+    # Wraps any buffer of native doubles (array('d'), numpy array, mmap, ...) without copying it
+    @classmethod
+    def from_buffer(cls, buffer) -> 'PointArray':
+
+        view = memoryview(buffer)
+
+        if view.format != 'd' or view.ndim != 1:
+            view = view.cast('B').cast('d')
+
+        if len(view) % 2 != 0:
+            raise ValueError('Buffer must hold an even number of coordinates.')
+
+        point_array = cls.__new__(cls)
+        point_array._storage = buffer
+        point_array._coords = view
+
+        return point_array
+
+    @classmethod
+    def from_numpy(cls, points: np.ndarray) -> 'PointArray':
+        return cls.from_buffer(np.ascontiguousarray(points, dtype=np.float64))
+
+    def __len__(self) -> int:
+        return len(self._coords) // 2
+
+    def __getitem__(self, index: int) -> PointView:
+
+        size = len(self)
+
+        if index < 0:
+            index += size
+
+        if not 0 <= index < size:
+            raise IndexError('PointArray index out of range')
+
+        return PointView(self, index)
+
+    def __iter__(self):
+
+        for i in range(len(self)):
+            yield PointView(self, i)
+
+    def __repr__(self):
+        return 'PointArray({})'.format(self.to_list())
+
+    def append(self, x: float, y: float) -> None:
+
+        if not isinstance(self._storage, array):
+            raise TypeError('Only PointArrays owning their storage can grow.')
+
+        # the memoryview export has to be released before the array can be resized, it is taken again
+        #   even when the resize fails (other exports, as arrays from as_numpy, are still alive)
+        self._coords.release()
+
+        try:
+            self._storage.append(x)
+            self._storage.append(y)
+
+        except BufferError:
+            raise BufferError('PointArray can not grow while buffers exported from it (as arrays from as_numpy) are alive.') from None
+
+        finally:
+            self._coords = memoryview(self._storage)
+
+    def coords(self, index: int) -> tuple:
+        return self._coords[2 * index], self._coords[2 * index + 1]
+
+    def to_list(self) -> list:
+
+        flat = self._coords.tolist()
+        return list(zip(flat[0::2], flat[1::2]))
+
+    # (N, 2) float64 array sharing memory with the point array
+    def as_numpy(self) -> np.ndarray:
+        return np.frombuffer(self._coords, dtype=np.float64).reshape(-1, 2)
+
+    def nbytes(self) -> int:
+        return self._coords.nbytes
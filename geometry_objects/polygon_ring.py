@@ -0,0 +1,176 @@
+from array import array
+
+import numpy as np
+
+from geometry_objects.point import Point
+from geometry_objects.point import Vertex
+from geometry_objects.predicates import orient2d
+from geometry_objects.predicates import orientation_arrays
+
+"""
+    Doubly linked polygon rings in contiguous buffers
+
+    A node is an index: its coordinates are at coords[2i], coords[2i+1] and its neighbours at next[i]
+    and prev[i], so traversals read three flat buffers instead of chasing Vertex objects.
+    insert, remove and connect follow BaseNode exactly, a new or removed node links to itself.
+    The buffers are exposed to numpy without copying for the vectorized passes.
+"""
+
+
+class PolygonRing:
+
+    # a single ring over the points in the given order, node i being points[i]
+    def __init__(self, points: list = ()):
+
+        self.coords = array('d')
+        self.next_nodes = array('i')
+        self.prev_nodes = array('i')
+
+        size = len(points)
+
+        for p in points:
+            self.coords.append(p[0])
+            self.coords.append(p[1])
+
+        self.next_nodes.extend([(i + 1) % size for i in range(size)])
+        self.prev_nodes.extend([(i - 1) % size for i in range(size)])
+
+    # a ring over a linked list of Vertex objects, starting from the given one
+    @classmethod
+    def from_vertex(cls, start: Vertex) -> 'PolygonRing':
+
+        points = [(start.x, start.y)]
+        v = start.next()
+
+        while v is not start:
+            points.append((v.x, v.y))
+            v = v.next()
+
+        return cls(points)
+
+    def __len__(self):
+        return len(self.next_nodes)
+
+    # new node linked to itself, returns its index
+    def add(self, x: float, y: float) -> int:
+
+        i = len(self.next_nodes)
+
+        self.coords.append(x)
+        self.coords.append(y)
+        self.next_nodes.append(i)
+        self.prev_nodes.append(i)
+
+        return i
+
+    def next(self, i: int) -> int:
+        return self.next_nodes[i]
+
+    def previous(self, i: int) -> int:
+        return self.prev_nodes[i]
+
+    def next_vertex(self, i: int, orientation: int = 1) -> int:
+        return self.next_nodes[i] if orientation > 0 else self.prev_nodes[i]
+
+    def point(self, i: int) -> Point:
+        return Point(self.coords[2 * i], self.coords[2 * i + 1])
+
+    def xy(self, i: int) -> tuple:
+        return self.coords[2 * i], self.coords[2 * i + 1]
+
+    # links node b after node a, returns b
+    def insert(self, a: int, b: int) -> int:
+
+        following = self.next_nodes[a]
+
+        self.prev_nodes[b] = a
+        self.next_nodes[b] = following
+        self.prev_nodes[following] = b
+        self.next_nodes[a] = b
+
+        return b
+
+    # unlinks node a, which is left linked to itself, returns a
+    def remove(self, a: int) -> int:
+
+        prev_node, next_node = self.prev_nodes[a], self.next_nodes[a]
+
+        self.next_nodes[prev_node] = next_node
+        self.prev_nodes[next_node] = prev_node
+        self.next_nodes[a] = self.prev_nodes[a] = a
+
+        return a
+
+    # splices after a and b: joins two rings into one, or splits one ring into two
+    def connect(self, a: int, b: int):
+
+        pom1 = self.next_nodes[a]
+        pom2 = self.next_nodes[b]
+
+        self.next_nodes[a] = pom2
+        self.next_nodes[b] = pom1
+        self.prev_nodes[pom1] = b
+        self.prev_nodes[pom2] = a
+
+    # node indices of the ring of the given node, in order
+    def ring(self, start: int) -> list:
+
+        nodes = [start]
+        i = self.next_nodes[start]
+
+        while i != start:
+            nodes.append(i)
+            i = self.next_nodes[i]
+
+        return nodes
+
+    def ring_points(self, start: int) -> list:
+        return [self.xy(i) for i in self.ring(start)]
+
+    # same as Vertex.is_convex: a left turn, or a straight continuation
+    def is_convex(self, i: int) -> bool:
+
+        x, y = self.xy(i)
+        nx, ny = self.xy(self.next_nodes[i])
+        px, py = self.xy(self.prev_nodes[i])
+
+        ori = orient2d(x, y, nx, ny, px, py)
+
+        if ori != 0:
+            return ori > 0
+
+        return (nx - x) * (px - x) < 0 or (ny - y) * (py - y) < 0
+
+    # (N, 2) float64, next and prev int32 arrays sharing the buffers of the ring
+    #   The ring can not grow while the arrays are alive.
+    def as_numpy(self) -> tuple:
+
+        coords = np.frombuffer(self.coords, dtype=np.float64).reshape(-1, 2)
+        next_nodes = np.frombuffer(self.next_nodes, dtype=np.int32)
+        prev_nodes = np.frombuffer(self.prev_nodes, dtype=np.int32)
+
+        return coords, next_nodes, prev_nodes
+
+    # is_convex of every node at once, a node linked to itself is not convex
+    def convex_mask(self) -> np.ndarray:
+
+        if not len(self):
+            return np.zeros(0, dtype=bool)
+
+        coords, next_nodes, prev_nodes = self.as_numpy()
+        v, n, p = coords, coords[next_nodes], coords[prev_nodes]
+
+        ori = orientation_arrays(v, n, p)
+        back = ((n[:, 0] - v[:, 0]) * (p[:, 0] - v[:, 0]) < 0) | ((n[:, 1] - v[:, 1]) * (p[:, 1] - v[:, 1]) < 0)
+
+        return (ori > 0) | ((ori == 0) & back)
+
+    # nodes of a reflex vertex, the ones an ear of a counter clockwise ring can not contain
+    def reflex_nodes(self) -> np.ndarray:
+
+        mask = ~self.convex_mask()
+
+        if len(mask):
+            mask &= np.frombuffer(self.next_nodes, dtype=np.int32) != np.arange(len(mask), dtype=np.int32)
+
+        return np.flatnonzero(mask)
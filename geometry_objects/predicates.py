@@ -0,0 +1,183 @@
+from math import fsum
+
+import numpy as np
+
+"""
+    Orientation predicates shared by every algorithm in the project
+
+    The orientation of point c from segment ab is the sign of the cross product (b - a) x (c - a):
+    1 when c is on the left (counter clockwise), -1 when it is on the right (clockwise)
+    and 0 when the points are collinear.
+
+    In robust mode (the default) the floating point result is accepted only when it is larger than
+    its worst case rounding error (Shewchuk's orient2d filter). Otherwise the sign is recomputed
+    exactly from the error-free expansions of the cross product terms, so the answer is exact while
+    costing about as much as the plain float test on non degenerate input.
+"""
+
+
+# half an ulp of 1.0, the relative error of a single rounded operation
+EPSILON: float = 2.0 ** -53
+
+# used to split a double into two non overlapping 26 bit halves (Dekker)
+SPLITTER: float = 2.0 ** 27 + 1.0
+
+# relative error bound of the floating point cross product
+CCW_ERROR_BOUND: float = (3.0 + 16.0 * EPSILON) * EPSILON
+
+_robust: bool = True
+
+
+# picks between exact (robust) and plain floating point (fast, inexact) orientation tests
+def set_robust(robust: bool) -> None:
+
+    global _robust
+    _robust = robust
+
+
+def is_robust() -> bool:
+    return _robust
+
+
+def _split(a: float) -> tuple:
+
+    c = SPLITTER * a
+    a_big = c - a
+    a_hi = c - a_big
+
+    return a_hi, a - a_hi
+
+
+# a * b as the exact sum of the rounded product and its rounding error
+def _two_product(a: float, b: float) -> tuple:
+
+    x = a * b
+    a_hi, a_lo = _split(a)
+    b_hi, b_lo = _split(b)
+
+    err1 = x - a_hi * b_hi
+    err2 = err1 - a_lo * b_hi
+    err3 = err2 - a_hi * b_lo
+
+    return x, a_lo * b_lo - err3
+
+
+# exact sign of (b - a) x (c - a)
+#   The cross product expands to bx*cy - bx*ay - ax*cy - by*cx + by*ax + ay*cx. Every product is
+#   represented exactly by two doubles and fsum rounds the sum of the expansion correctly,
+#   which keeps its sign.
+def orient2d_exact(ax: float, ay: float, bx: float, by: float, cx: float, cy: float) -> int:
+
+    terms = []
+
+    for p, q in ((bx, cy), (-bx, ay), (-ax, cy), (-by, cx), (by, ax), (ay, cx)):
+        terms.extend(_two_product(p, q))
+
+    det = fsum(terms)
+
+    if det > 0:
+        return 1
+
+    if det < 0:
+        return -1
+
+    return 0
+
+
+# scalar fast path on raw coordinates, nothing is allocated
+def orient2d(ax: float, ay: float, bx: float, by: float, cx: float, cy: float) -> int:
+
+    det_left = (bx - ax) * (cy - ay)
+    det_right = (by - ay) * (cx - ax)
+    det = det_left - det_right
+
+    # when the two terms have different signs (or one is zero) no cancellation can happen
+    if _robust and det_left != 0:
+
+        if det_left > 0:
+
+            if det_right <= 0:
+                return 1
+
+            det_sum = det_left + det_right
+
+        else:
+
+            if det_right >= 0:
+                return -1
+
+            det_sum = -det_left - det_right
+
+        error_bound = CCW_ERROR_BOUND * det_sum
+
+        if -error_bound < det < error_bound:
+            return orient2d_exact(ax, ay, bx, by, cx, cy)
+
+    if det > 0:
+        return 1
+
+    if det < 0:
+        return -1
+
+    return 0
+
+
+def _orientation_signs(ax, ay, bx, by, cx, cy) -> np.ndarray:
+
+    det_left = (bx - ax) * (cy - ay)
+    det_right = (by - ay) * (cx - ax)
+    det = det_left - det_right
+
+    signs = np.sign(det).astype(np.int8)
+
+    if _robust:
+
+        error_bound = CCW_ERROR_BOUND * (np.abs(det_left) + np.abs(det_right))
+        uncertain = np.flatnonzero(np.abs(det) < error_bound)
+
+        if len(uncertain):
+
+            ax, ay, bx, by, cx, cy = np.broadcast_arrays(ax, ay, bx, by, cx, cy)
+
+            for i in uncertain.tolist():
+                signs.flat[i] = orient2d_exact(float(ax.flat[i]), float(ay.flat[i]), float(bx.flat[i]),
+                                               float(by.flat[i]), float(cx.flat[i]), float(cy.flat[i]))
+
+    return signs
+
+
+# element-wise orientations of broadcastable (..., 2) arrays of points a, b and c
+def orientation_arrays(a: np.ndarray, b: np.ndarray, c: np.ndarray) -> np.ndarray:
+
+    a = np.asarray(a, dtype=np.float64)
+    b = np.asarray(b, dtype=np.float64)
+    c = np.asarray(c, dtype=np.float64)
+
+    return _orientation_signs(a[..., 0], a[..., 1], b[..., 0], b[..., 1], c[..., 0], c[..., 1])
+
+
+# element-wise orientations decided by the floating point filter alone, 0 where the float result is too
+#   close to call: a nonzero sign is exact, a zero one may be anything. For culling that can not afford
+#   the exact fallback, as in filters keeping every point not certainly inside.
+def orientation_arrays_filtered(a: np.ndarray, b: np.ndarray, c: np.ndarray) -> np.ndarray:
+
+    a = np.asarray(a, dtype=np.float64)
+    b = np.asarray(b, dtype=np.float64)
+    c = np.asarray(c, dtype=np.float64)
+
+    det_left = (b[..., 0] - a[..., 0]) * (c[..., 1] - a[..., 1])
+    det_right = (b[..., 1] - a[..., 1]) * (c[..., 0] - a[..., 0])
+    det = det_left - det_right
+
+    signs = np.sign(det).astype(np.int8)
+    signs[np.abs(det) <= CCW_ERROR_BOUND * (np.abs(det_left) + np.abs(det_right))] = 0
+
+    return signs
+
+
+# orientations of a whole batch of query points c_array against the single segment ab
+def orientation_many(a, b, c_array: np.ndarray) -> np.ndarray:
+
+    c_array = np.asarray(c_array, dtype=np.float64)
+
+    return _orientation_signs(float(a[0]), float(a[1]), float(b[0]), float(b[1]), c_array[:, 0], c_array[:, 1])
@@ -0,0 +1,155 @@
+from math import pi
+
+import numpy as np
+
+from geometry_objects.point import Point
+from geometry_objects.vector import Vector
+
+"""
+    Columnar array of segments
+
+    The heads and the tails of N segments are kept as two (N, 2) float64 arrays. The same properties
+    as on Vector (lengths, directions, normals, slopes, bounds) are computed for all segments at once
+    on first use and kept until the end points are replaced, as rotate and flip do.
+"""
+
+
+class SegmentArray:
+
+    def __init__(self, heads: np.ndarray, tails: np.ndarray):
+
+        heads = np.ascontiguousarray(heads, dtype=np.float64).reshape(-1, 2)
+        tails = np.ascontiguousarray(tails, dtype=np.float64).reshape(-1, 2)
+
+        if heads.shape != tails.shape:
+            raise ValueError('Heads and tails must be two (N, 2) arrays of the same shape.')
+
+        self._heads = heads
+        self._tails = tails
+        self.invalidate()
+
+    # from Vectors, or pairs of points given as tuples or Points
+    @classmethod
+    def from_segments(cls, segments: list) -> 'SegmentArray':
+
+        ends = [(s.head, s.tail) if isinstance(s, Vector) else (s[0], s[1]) for s in segments]
+        coords = [[(p.x, p.y) if isinstance(p, Point) else (p[0], p[1]) for p in pair] for pair in ends]
+        coords = np.array(coords, dtype=np.float64).reshape(-1, 2, 2)
+
+        return cls(coords[:, 0], coords[:, 1])
+
+    # from an (N, 4) array of rows (head x, head y, tail x, tail y)
+    @classmethod
+    def from_numpy(cls, segments: np.ndarray) -> 'SegmentArray':
+
+        segments = np.asarray(segments, dtype=np.float64).reshape(-1, 4)
+        return cls(segments[:, :2], segments[:, 2:])
+
+    def __len__(self) -> int:
+        return len(self._heads)
+
+    def __getitem__(self, index: int) -> Vector:
+
+        head, tail = self._heads[index].tolist(), self._tails[index].tolist()
+        return Vector(Point(*head), Point(*tail))
+
+    def __iter__(self):
+
+        for i in range(len(self)):
+            yield self[i]
+
+    def __repr__(self):
+        return 'SegmentArray({})'.format(self.as_numpy().tolist())
+
+    def to_vectors(self) -> list:
+        return [Vector(Point(hx, hy), Point(tx, ty)) for hx, hy, tx, ty in self.as_numpy().tolist()]
+
+    # (N, 4) array of rows (head x, head y, tail x, tail y)
+    def as_numpy(self) -> np.ndarray:
+        return np.hstack((self._heads, self._tails))
+
+    @property
+    def heads(self) -> np.ndarray:
+        return self._heads
+
+    @heads.setter
+    def heads(self, heads: np.ndarray):
+
+        self._heads = np.ascontiguousarray(heads, dtype=np.float64).reshape(self._tails.shape)
+        self.invalidate()
+
+    @property
+    def tails(self) -> np.ndarray:
+        return self._tails
+
+    @tails.setter
+    def tails(self, tails: np.ndarray):
+
+        self._tails = np.ascontiguousarray(tails, dtype=np.float64).reshape(self._heads.shape)
+        self.invalidate()
+
+    def invalidate(self) -> None:
+        self._lengths = self._directions = self._normals = self._slopes = self._bounds = None
+
+    # (N, 2) tails - heads
+    @property
+    def directions(self) -> np.ndarray:
+
+        if self._directions is None:
+            self._directions = self._tails - self._heads
+
+        return self._directions
+
+    # (N, 2) directions turned clockwise, as Vector.normal
+    @property
+    def normals(self) -> np.ndarray:
+
+        if self._normals is None:
+            directions = self.directions
+            self._normals = np.column_stack((directions[:, 1], -directions[:, 0]))
+
+        return self._normals
+
+    @property
+    def lengths(self) -> np.ndarray:
+
+        if self._lengths is None:
+            self._lengths = np.hypot(self.directions[:, 0], self.directions[:, 1])
+
+        return self._lengths
+
+    # angles of the directions in degrees in [0, 360), as Vector.slope
+    @property
+    def slopes(self) -> np.ndarray:
+
+        if self._slopes is None:
+
+            dx, dy = self.directions[:, 0], self.directions[:, 1]
+            theta = np.arctan2(dy, dx) * (360 / 2 / pi)
+
+            self._slopes = np.where(dy >= 0.0, theta, 360 + theta)
+
+        return self._slopes
+
+    # (N, 4) rows (min x, min y, max x, max y)
+    @property
+    def bounds(self) -> np.ndarray:
+
+        if self._bounds is None:
+            self._bounds = np.hstack((np.minimum(self._heads, self._tails), np.maximum(self._heads, self._tails)))
+
+        return self._bounds
+
+    # turns every segment by 90 degrees around its middle, as Vector.rotate
+    def rotate(self, positive: bool = True) -> None:
+
+        middles = (self._tails + self._heads) / 2
+        half_normals = self.normals * (0.5 if positive else -0.5)
+
+        self._heads, self._tails = middles - half_normals, middles + half_normals
+        self.invalidate()
+
+    def flip(self) -> None:
+
+        self._heads, self._tails = self._tails, self._heads
+        self.invalidate()
@@ -4,16 +4,88 @@ from math import pi
 
 from geometry_objects.point import Point
 
+"""
+    Directed segments from head to tail
+
+    The length, direction, normal, slope and bounds of a vector are computed on first use and kept until
+    head or tail is assigned again (as rotate and flip do). Moving the head or tail Point in place is not
+    seen by the cache, assign a new Point instead.
+"""
+
 
 class Vector:
 
+    __slots__ = ('_head', '_tail', '_length', '_direction', '_normal', '_slope', '_bounds')
+
     def __init__(self, head: 'Point', tail: 'Point'):
 
-        self.head = head
-        self.tail = tail
+        self._head = head
+        self._tail = tail
+        self.invalidate()
+
+    @property
+    def head(self) -> 'Point':
+        return self._head
+
+    @head.setter
+    def head(self, head: 'Point'):
+
+        self._head = head
+        self.invalidate()
+
+    @property
+    def tail(self) -> 'Point':
+        return self._tail
+
+    @tail.setter
+    def tail(self, tail: 'Point'):
+
+        self._tail = tail
+        self.invalidate()
+
+    def invalidate(self) -> None:
+        self._length = self._direction = self._normal = self._slope = self._bounds = None
+
+    # tail - head as an (x, y) tuple
+    @property
+    def direction(self) -> tuple:
+
+        if self._direction is None:
+            self._direction = (self._tail.x - self._head.x, self._tail.y - self._head.y)
+
+        return self._direction
+
+    # the direction turned clockwise, pointing to the right of the vector
+    @property
+    def normal(self) -> tuple:
+
+        if self._normal is None:
+            dx, dy = self.direction
+            self._normal = (dy, -dx)
+
+        return self._normal
+
+    @property
+    def length(self) -> float:
+
+        if self._length is None:
+            self._length = self._head.euclidean_distance(self._tail)
+
+        return self._length
+
+    # (min x, min y, max x, max y)
+    @property
+    def bounds(self) -> tuple:
+
+        if self._bounds is None:
+
+            (hx, hy), (tx, ty) = (self._head.x, self._head.y), (self._tail.x, self._tail.y)
+            self._bounds = (min(hx, tx), min(hy, ty), max(hx, tx), max(hy, ty))
+
+        return self._bounds
 
     def magnitude(self) -> float:
-        return self.head.euclidean_distance(self.tail)
+        return self.length
 
     def __str__(self):
         return repr(self)
@@ -22,12 +94,10 @@ class Vector:
         return '{}, {}'.format(self.head, self.tail)
 
     def direction_vector(self):
-        return self.tail - self.head
+        return Point(*self.direction)
 
     def orientation_vector(self):
-
-        direction_vector: Point = self.direction_vector()
-        return Point(direction_vector.y, -direction_vector.x)
+        return Point(*self.normal)
 
     def rotate(self, positive: bool = True) -> None:
 
@@ -48,9 +118,8 @@ class Vector:
 
     def dot(self, other: 'Vector') -> float:
 
-        prod_x = (self.tail.x - self.head.x) * (other.tail.x - other.head.x)
-        prod_y = (self.tail.y - self.head.y) * (other.tail.y - other.head.y)
-        return prod_x + prod_y
+        (dx, dy), (other_dx, other_dy) = self.direction, other.direction
+        return dx * other_dx + dy * other_dy
 
     def angle_between(self, other: 'Vector') -> float:
 
@@ -69,7 +138,11 @@ class Vector:
         return round(alpha, 10)
 
     def slope(self):
-        return (self.tail - self.head).slope()
+
+        if self._slope is None:
+            self._slope = Point(*self.direction).slope()
+
+        return self._slope
 
     def do_intersect(self, s_2: 'Vector') -> bool:
 
@@ -0,0 +1,227 @@
+import os
+from collections import OrderedDict
+from hashlib import blake2b
+from threading import Lock
+
+import numpy as np
+
+from berg_problems.chapter_1 import hull_from_hull_segments
+from file_formats.point_set import load_point_set
+from file_formats.point_set import write_point_set
+from geometry_objects.point import Point
+from problems.convex_hull import convex_hull_graham_scan
+from problems.simple_poly import simple_poly
+
+"""
+    Memoized hulls and polygons of repeated point sets
+
+    A result is keyed by a blake2b hash of the float64 coordinate buffer of the input (in its order) and
+    of the function and its arguments. It is stored as the indices of its points in the input, so a hit
+    rebuilds a fresh list out of the caller's own points, and a cache of many large inputs stays small.
+    The least recently used results are evicted once there are more than max_entries of them, or more
+    than max_points stored indices.
+
+    With a directory set, every result is also written there in the point set format (the coordinates
+    of the result points), and a result missing from memory is looked up on disk before it is computed,
+    so a restarted process starts warm. Points with the same coordinates are interchangeable: a result
+    read from disk uses the first input point with the given coordinates.
+
+    The wrapped functions are called on a copy of the input, simple_poly and convex_hull_graham_scan
+    do not reorder the caller's list through the cache.
+"""
+
+
+def coordinates(points) -> np.ndarray:
+
+    if isinstance(points, np.ndarray):
+        return np.ascontiguousarray(points, dtype=np.float64).reshape(-1, 2)
+
+    coords = [(p.x, p.y) if isinstance(p, Point) else (p[0], p[1]) for p in points]
+    return np.array(coords, dtype=np.float64).reshape(-1, 2)
+
+
+# hex digest of the coordinates of the points and of any extra values the result depends on
+def fingerprint(points, *extra) -> str:
+
+    coords = coordinates(points)
+
+    digest = blake2b(digest_size=16)
+    digest.update(repr((len(coords),) + extra).encode())
+    digest.update(coords)
+
+    return digest.hexdigest()
+
+
+class HullCache:
+
+    def __init__(self, max_entries: int = 1024, max_points: int = None, directory: str = None):
+
+        self.max_entries = max_entries
+        self.max_points = max_points
+        self.directory = directory
+
+        # key -> indices of the result points in the input
+        self.entries = OrderedDict()
+        self.stored_points = 0
+        self.lock = Lock()
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def convex_hull_graham_scan(self, vertices: list, strict: bool = False) -> list:
+        return self.cached('convex_hull_graham_scan', convex_hull_graham_scan, vertices, vertices, strict)
+
+    def simple_poly(self, vertices: list) -> list:
+        return self.cached('simple_poly', simple_poly, vertices, vertices)
+
+    # the result points are end points of the edges, the first end point with their coordinates is returned
+    def hull_from_hull_segments(self, edges: list) -> list:
+        return self.cached('hull_from_hull_segments', hull_from_hull_segments, edges,
+                           [p for e in edges for p in (e[0], e[1])])
+
+    # Result of function(list(argument), *args), served from the cache when possible
+    #   points are the input points the result is made of, the key is computed from their coordinates.
+    def cached(self, name: str, function, argument, points: list, *args) -> list:
+
+        key = name + '-' + fingerprint(points, name, *args)
+
+        with self.lock:
+
+            indices = self.entries.get(key)
+
+            if indices is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return [points[i] for i in indices.tolist()]
+
+        indices = self.load(key, points)
+
+        if indices is not None:
+
+            with self.lock:
+                self.disk_hits += 1
+                self.store(key, indices)
+
+            return [points[i] for i in indices.tolist()]
+
+        result = function(list(argument), *args)
+        indices = self.indices_of(result, points)
+
+        with self.lock:
+            self.misses += 1
+            self.store(key, indices)
+
+        self.save(key, result)
+
+        return list(result)
+
+    @staticmethod
+    def indices_of(result: list, points: list):
+
+        positions = {}
+
+        for i, p in enumerate(coordinates(points).tolist()):
+            positions.setdefault(tuple(p), i)
+
+        return np.array([positions[tuple(p)] for p in coordinates(result).tolist()], dtype=np.intp)
+
+    # adds an entry, the lock must be held
+    def store(self, key: str, indices: np.ndarray):
+
+        if key in self.entries:
+            self.stored_points -= len(self.entries.pop(key))
+
+        self.entries[key] = indices
+        self.stored_points += len(indices)
+
+        while len(self.entries) > 1 and (len(self.entries) > self.max_entries or
+                                         (self.max_points is not None and self.stored_points > self.max_points)):
+
+            _, evicted = self.entries.popitem(last=False)
+            self.stored_points -= len(evicted)
+            self.evictions += 1
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, key + '.cgps')
+
+    def save(self, key: str, result: list):
+
+        if self.directory is None:
+            return
+
+        # written under a temporary name first, so a reader never maps a partial file
+        path = self.path(key)
+        temporary = '{}.{}.tmp'.format(path, os.getpid())
+
+        write_point_set(temporary, coordinates(result))
+        os.replace(temporary, path)
+
+    def load(self, key: str, points: list):
+
+        if self.directory is None or not os.path.exists(self.path(key)):
+            return None
+
+        try:
+            coords, _ = load_point_set(self.path(key))
+            result = np.array(coords)
+
+        except (OSError, ValueError):
+            return None
+
+        try:
+            return self.indices_of(result, points)
+
+        except KeyError:
+            return None
+
+    def stats(self) -> dict:
+
+        with self.lock:
+
+            lookups = self.hits + self.disk_hits + self.misses
+
+            return {
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self.entries),
+                'stored_points': self.stored_points,
+                'hit_rate': (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+            }
+
+    # empties the memory tier and the statistics, and with disk set also the files of the directory
+    def clear(self, disk: bool = False):
+
+        with self.lock:
+
+            self.entries.clear()
+            self.stored_points = 0
+            self.hits = self.disk_hits = self.misses = self.evictions = 0
+
+        if disk and self.directory is not None:
+
+            for name in os.listdir(self.directory):
+
+                if name.endswith('.cgps'):
+                    os.remove(os.path.join(self.directory, name))
+
+
+if __name__ == '__main__':
+
+    cache = HullCache(max_entries=2)
+    l1 = [(0, 3), (1, 1), (2, 2), (4, 4), (0, 0), (1, 2), (3, 1), (3, 3)]
+
+    print('points: ', l1)
+    print('hull: ', cache.convex_hull_graham_scan(l1))
+    print('hull: ', cache.convex_hull_graham_scan(l1))
+    print('simple poly: ', cache.simple_poly(l1))
+    print('stats: ', cache.stats())
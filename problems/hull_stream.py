@@ -0,0 +1,114 @@
+import csv
+from itertools import islice
+
+import numpy as np
+
+from file_formats.point_set import MAGIC
+from file_formats.point_set import load_point_array
+from problems.convex_hull import akl_toussaint_filter
+from problems.convex_hull import as_point_array
+from problems.convex_hull import convex_hull_monotone_chain
+
+"""
+    Streaming convex hull
+
+    The input is consumed one chunk at a time and only the running hull and the current chunk are
+    kept in memory: the hull of the chunk is merged into the running hull after every chunk, which
+    is exact since the hull of a union is the hull of the union of the hulls.
+"""
+
+
+# number of points per chunk used by the chunking helpers
+STREAM_CHUNK_SIZE: int = 1 << 16
+
+
+# Hull of all points in an iterable of chunks, every chunk being an (N, 2) array or a list of points
+#   Returns the hull corners as an (H, 2) array in counter clockwise order, starting from the
+#   lexicographically smallest point.
+def hull_stream(chunks) -> np.ndarray:
+
+    hull = np.empty((0, 2), dtype=np.float64)
+
+    for chunk in chunks:
+
+        chunk = as_point_array(chunk) if len(chunk) else np.empty((0, 2), dtype=np.float64)
+
+        # most of a chunk is usually inside its extreme points and never needs to be copied
+        kept, _ = akl_toussaint_filter(chunk)
+        candidates = np.concatenate((hull, chunk[kept]))
+
+        hull = candidates[convex_hull_monotone_chain(candidates)]
+
+    return hull
+
+
+# chunks of an (N, 2) array, np.memmap arrays are only read one chunk at a time
+def iter_array_chunks(points: np.ndarray, chunk_size: int = STREAM_CHUNK_SIZE):
+
+    for start in range(0, len(points), chunk_size):
+        yield points[start:start + chunk_size]
+
+
+# chunks of any iterable of points, generators included
+def iter_point_chunks(points, chunk_size: int = STREAM_CHUNK_SIZE):
+
+    points = iter(points)
+
+    while True:
+
+        chunk = list(islice(points, chunk_size))
+
+        if not chunk:
+            return
+
+        yield np.array(chunk, dtype=np.float64)
+
+
+# chunks of the rows of a csv.reader, the coordinates are taken from the given columns
+def iter_csv_chunks(rows, chunk_size: int = STREAM_CHUNK_SIZE, columns: tuple = (0, 1)):
+
+    x_column, y_column = columns
+    points = ((float(row[x_column]), float(row[y_column])) for row in rows)
+
+    yield from iter_point_chunks(points, chunk_size)
+
+
+# chunks of a csv file with one point per line, an optional header line is skipped
+def iter_csv_file_chunks(path: str, chunk_size: int = STREAM_CHUNK_SIZE, columns: tuple = (0, 1),
+                         header: bool = False):
+
+    with open(path, newline='') as file:
+
+        rows = csv.reader(file)
+
+        if header:
+            next(rows, None)
+
+        yield from iter_csv_chunks(rows, chunk_size, columns)
+
+
+# Chunks of a raw binary file of little endian float64 (x, y) pairs, read through a memory map
+#   A file starting with the point set magic is read as a point set instead (unless an offset is given),
+#   so its header is not taken for points.
+def iter_binary_file_chunks(path: str, chunk_size: int = STREAM_CHUNK_SIZE, offset: int = 0):
+
+    if not offset:
+
+        with open(path, 'rb') as file:
+            magic = file.read(len(MAGIC))
+
+        if magic == MAGIC:
+            yield from iter_point_set_chunks(path, chunk_size)
+            return
+
+    points = np.memmap(path, dtype='<f8', mode='r', offset=offset).reshape(-1, 2)
+
+    yield from iter_array_chunks(points, chunk_size)
+
+
+# chunks of the points of a point set file (file_formats.point_set), mapped without copying them
+def iter_point_set_chunks(path: str, chunk_size: int = STREAM_CHUNK_SIZE):
+
+    points, _ = load_point_array(path)
+
+    yield from iter_array_chunks(points.as_numpy(), chunk_size)
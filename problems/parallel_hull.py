@@ -0,0 +1,329 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from berg_problems.chapter_1 import find_convex_union
+from geometry_objects.predicates import orientation_arrays_filtered
+from problems.convex_hull import as_point_array
+from problems.convex_hull import monotone_chain_sorted
+from problems.convex_hull import remove_collinear_vertices
+
+"""
+    Parallel divide and conquer convex hull
+
+    The points are sorted by x and cut into k vertical slabs that do not share an x coordinate.
+    Every slab is hulled in a worker process which reads the points from a shared memory block,
+    so only the slab bounds and the (small) slab hulls cross the process boundary. The slab hulls
+    are then merged pairwise with find_convex_union.
+
+    hull_many hulls many independent point sets packed into one array. The sets are cut into shards of
+    about the same number of points and every worker sorts and filters its shard with array operations,
+    then runs monotone_chain_sorted on what is left of every set. The points, the offsets and the output
+    all live in one shared memory block: the hull of a set is never larger than the set, so every worker
+    writes its hulls in place.
+"""
+
+
+# inputs smaller than this are not worth starting a process pool for, unless the workers are given
+PARALLEL_MIN_POINTS: int = 100000
+
+# shards per worker in hull_many, more shards even out sets of different sizes
+SHARDS_PER_WORKER: int = 4
+
+
+# Hull of an (N, 2) array computed over all cores
+#   Returns the indices of the hull vertices in counter clockwise order, starting from the
+#   lexicographically smallest point, the same as convex_hull_monotone_chain.
+def convex_hull_parallel(points: np.ndarray, workers: int = None, slabs: int = None) -> np.ndarray:
+
+    points = as_point_array(points)
+    automatic = workers is None
+    workers = workers or os.cpu_count() or 1
+    slabs = slabs or workers
+
+    order = np.lexsort((points[:, 1], points[:, 0]))
+    bounds = slab_bounds(points[order, 0], slabs)
+
+    if workers == 1 or len(bounds) < 3 or (automatic and len(points) < PARALLEL_MIN_POINTS):
+        hulls = [monotone_chain_sorted(points, order[lo:hi]) for lo, hi in zip(bounds[:-1], bounds[1:])]
+
+    else:
+        hulls = [order[hull] for hull in shared_slab_hulls(points[order], bounds, workers)]
+
+    return merge_slab_hulls(points, hulls)
+
+
+# slab boundaries in the sorted order, moved back so that no x coordinate is shared by two slabs
+def slab_bounds(sorted_xs: np.ndarray, slabs: int) -> list:
+
+    size = len(sorted_xs)
+    bounds = [0]
+
+    for b in np.linspace(0, size, slabs + 1).astype(np.int64)[1:-1].tolist():
+
+        if not 0 < b < size:
+            continue
+
+        b = int(np.searchsorted(sorted_xs, sorted_xs[b], side='left'))
+
+        if b > bounds[-1]:
+            bounds.append(b)
+
+    bounds.append(size)
+    return bounds
+
+
+def shared_slab_hulls(sorted_points: np.ndarray, bounds: list, workers: int) -> list:
+
+    memory = SharedMemory(create=True, size=sorted_points.nbytes)
+
+    try:
+        shared = np.ndarray(sorted_points.shape, dtype=np.float64, buffer=memory.buf)
+        shared[:] = sorted_points
+        del shared
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(slab_hull, memory.name, len(sorted_points), lo, hi)
+                       for lo, hi in zip(bounds[:-1], bounds[1:])]
+
+            return [future.result() for future in futures]
+
+    finally:
+        memory.close()
+        memory.unlink()
+
+
+# worker side: hull of the already sorted points [lo, hi) of the shared block, as indices into the block
+def slab_hull(name: str, size: int, lo: int, hi: int) -> np.ndarray:
+
+    memory = SharedMemory(name=name)
+
+    try:
+        points = np.ndarray((size, 2), dtype=np.float64, buffer=memory.buf)
+        hull = monotone_chain_sorted(points, np.arange(lo, hi))
+        del points
+
+    finally:
+        memory.close()
+
+    return hull
+
+
+# merges the hulls of neighbouring slabs pairwise until a single hull is left
+def merge_slab_hulls(points: np.ndarray, hulls: list) -> np.ndarray:
+
+    # find_convex_union works on clockwise hulls of tuples, the index rides along as a third coordinate
+    hulls = [[(points[i, 0], points[i, 1], i) for i in hull[::-1].tolist()] for hull in hulls]
+
+    while len(hulls) > 1:
+
+        merged = [slab_hull_union(points, hulls[i], hulls[i+1]) for i in range(0, len(hulls) - 1, 2)]
+
+        if len(hulls) % 2:
+            merged.append(hulls[-1])
+
+        hulls = merged
+
+    if not hulls or not hulls[0]:
+        return np.empty(0, dtype=np.intp)
+
+    # back to counter clockwise order starting from the lexicographically smallest point
+    hull = hulls[0][::-1]
+    start = hull.index(min(hull))
+
+    return np.array([p[2] for p in hull[start:] + hull[:start]], dtype=np.intp)
+
+
+# union of the clockwise hulls of two neighbouring slabs
+def slab_hull_union(points: np.ndarray, hull1: list, hull2: list) -> list:
+
+    # a point or a segment has no tangents to walk around, the corners of both are hulled again instead
+    if len(hull1) < 3 or len(hull2) < 3:
+
+        corners = np.array([p[2] for p in hull1 + hull2], dtype=np.intp)
+        order = corners[np.lexsort((points[corners, 1], points[corners, 0]))]
+
+        return [(points[i, 0], points[i, 1], i) for i in monotone_chain_sorted(points, order)[::-1].tolist()]
+
+    return remove_collinear_vertices(find_convex_union(hull1, hull2))
+
+
+# Hulls of many point sets packed into one (N, 2) array, the i-th set being points[offsets[i]:offsets[i+1]]
+#   Returns the concatenated hull indices (into the packed array) and the offsets of every hull within
+#   them, the same as convex_hull_monotone_chain_batch.
+def hull_many(points: np.ndarray, offsets: np.ndarray, workers: int = None) -> tuple:
+
+    points = as_point_array(points)
+    offsets = np.asarray(offsets, dtype=np.int64)
+    automatic = workers is None
+    workers = workers or os.cpu_count() or 1
+
+    if offsets.ndim != 1 or len(offsets) == 0 or offsets[0] != 0 or offsets[-1] != len(points) \
+            or np.any(np.diff(offsets) < 0):
+        raise ValueError('Offsets must be a non decreasing vector running from 0 to the number of points.')
+
+    sets = len(offsets) - 1
+    bounds = shard_bounds(offsets, workers * SHARDS_PER_WORKER)
+
+    if workers == 1 or len(bounds) < 3 or (automatic and len(points) < PARALLEL_MIN_POINTS):
+
+        out = np.empty(len(points), dtype=np.int64)
+        counts = np.empty(sets, dtype=np.int64)
+
+        hull_shard(points, offsets, out, counts, 0, sets)
+
+    else:
+        out, counts = shared_hull_shards(points, offsets, bounds, workers)
+
+    hull_offsets = np.zeros(len(offsets), dtype=np.int64)
+    np.cumsum(counts, out=hull_offsets[1:])
+
+    # the hull of set i is out[offsets[i]:offsets[i] + counts[i]]
+    starts = np.repeat(offsets[:-1] - hull_offsets[:-1], counts)
+    indices = out[np.arange(hull_offsets[-1]) + starts]
+
+    return indices.astype(np.intp), hull_offsets
+
+
+# set boundaries of shards holding about the same number of points
+def shard_bounds(offsets: np.ndarray, shards: int) -> list:
+
+    sets = len(offsets) - 1
+    cuts = np.searchsorted(offsets, np.linspace(0, offsets[-1], shards + 1)[1:-1]).tolist()
+
+    return [0] + sorted({c for c in cuts if 0 < c < sets}) + [sets]
+
+
+def shared_hull_shards(points: np.ndarray, offsets: np.ndarray, bounds: list, workers: int) -> tuple:
+
+    size, sets = len(points), len(offsets) - 1
+    memory = SharedMemory(create=True, size=8 * (2 * size + sets + 1 + size + sets))
+
+    try:
+        shared_points, shared_offsets, out, counts = shared_views(memory, size, sets)
+        shared_points[:] = points
+        shared_offsets[:] = offsets
+        del shared_points, shared_offsets
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(shared_hull_shard, memory.name, size, sets, lo, hi)
+                       for lo, hi in zip(bounds[:-1], bounds[1:])]
+
+            for future in futures:
+                future.result()
+
+        result = out.copy(), counts.copy()
+        del out, counts
+
+        return result
+
+    finally:
+        memory.close()
+        memory.unlink()
+
+
+# points, offsets, output and hull sizes laid out one after the other in the block
+def shared_views(memory: SharedMemory, size: int, sets: int) -> tuple:
+
+    points = np.ndarray((size, 2), dtype=np.float64, buffer=memory.buf)
+    offsets = np.ndarray((sets + 1,), dtype=np.int64, buffer=memory.buf, offset=16 * size)
+    out = np.ndarray((size,), dtype=np.int64, buffer=memory.buf, offset=16 * size + 8 * (sets + 1))
+    counts = np.ndarray((sets,), dtype=np.int64, buffer=memory.buf, offset=24 * size + 8 * (sets + 1))
+
+    return points, offsets, out, counts
+
+
+# worker side of hull_many
+def shared_hull_shard(name: str, size: int, sets: int, lo: int, hi: int) -> None:
+
+    memory = SharedMemory(name=name)
+
+    try:
+        views = shared_views(memory, size, sets)
+        hull_shard(*views, lo, hi)
+        del views
+
+    finally:
+        memory.close()
+
+
+# Hulls of the sets [lo, hi), the hull of set i is written to out[offsets[i]:] and its size to counts[i]
+#   The shard is sorted by (set, x, y) at once. Every point certainly inside the octagon of the extreme
+#   points of its set (as in akl_toussaint_filter) is dropped, with array operations and the float filter
+#   alone. Only monotone_chain_sorted over the remaining candidates of every set is left to the loop.
+def hull_shard(points: np.ndarray, offsets: np.ndarray, out: np.ndarray, counts: np.ndarray, lo: int, hi: int):
+
+    first, last = int(offsets[lo]), int(offsets[hi])
+    sizes = np.diff(offsets[lo:hi + 1])
+    starts = offsets[lo:hi] - first
+    shard = points[first:last]
+
+    if not len(shard):
+        counts[lo:hi] = 0
+        return
+
+    set_ids = np.repeat(np.arange(hi - lo), sizes)
+    order = np.lexsort((shard[:, 1], shard[:, 0], set_ids))
+    ordered = shard[order]
+    xs, ys = ordered[:, 0], ordered[:, 1]
+
+    # empty sets repeat nothing, their ends are only kept within the shard
+    starts, ends = np.minimum(starts, len(shard) - 1), np.maximum(starts + sizes - 1, 0)
+
+    filled = np.flatnonzero(sizes)
+    filled_starts, filled_sizes = starts[filled], sizes[filled]
+
+    # first position of the minimum and last position of the maximum of the key in every set
+    def extremes(key: np.ndarray) -> tuple:
+
+        lows = np.flatnonzero(key == np.repeat(np.minimum.reduceat(key, filled_starts), filled_sizes))
+        highs = np.flatnonzero(key == np.repeat(np.maximum.reduceat(key, filled_starts), filled_sizes))
+
+        low, high = starts.copy(), ends.copy()
+        low[filled] = lows[np.searchsorted(lows, filled_starts)]
+        high[filled] = highs[np.searchsorted(highs, ends[filled], side='right') - 1]
+
+        return low, high
+
+    low_sum, high_sum = extremes(xs + ys)
+    low_y, high_y = extremes(ys)
+    low_difference, high_difference = extremes(xs - ys)
+
+    # the corners of the octagon in counter clockwise order, as a point per sorted point
+    corners = [ordered[np.repeat(c, sizes)] for c in (starts, low_sum, low_y, high_difference, ends, high_sum,
+                                                      high_y, low_difference)]
+
+    # only points certainly inside are dropped, the uncertain ones are left to the exact chains
+    inside = np.ones(len(ordered), dtype=bool)
+
+    # an edge between two copies of one corner is skipped
+    for k in range(len(corners)):
+
+        a, b = corners[k], corners[(k + 1) % len(corners)]
+        inside &= (orientation_arrays_filtered(a, b, ordered) > 0) | np.all(a == b, axis=1)
+
+    # the first and the last point of a set are corners whatever the filter says
+    candidates = ~inside
+    candidates[starts[filled]] = candidates[ends[filled]] = True
+    candidates = np.flatnonzero(candidates)
+
+    bounds = offsets[lo:hi + 1] - first
+    candidate_bounds = np.searchsorted(candidates, bounds).tolist()
+
+    hulls = [monotone_chain_sorted(ordered, candidates[candidate_bounds[i]:candidate_bounds[i+1]])
+             for i in range(hi - lo)]
+
+    hull_sizes = [len(hull) for hull in hulls]
+    counts[lo:hi] = hull_sizes
+    total = sum(hull_sizes)
+
+    if not total:
+        return
+
+    # hull positions in the shard order, written to the output ranges of their sets
+    positions = np.concatenate(hulls)
+    targets = np.repeat(bounds[:-1], hull_sizes) + (np.arange(total) - np.repeat(np.cumsum(hull_sizes) - hull_sizes, hull_sizes))
+
+    out[first + targets] = first + order[positions]
@@ -0,0 +1,162 @@
+import numpy as np
+
+from geometry_objects.angular_order import angular_order
+from geometry_objects.point import Point
+from geometry_objects.predicates import orient2d
+
+"""
+    Polygons from unordered edges
+
+    The edges are given as pairs of points in any order and direction. Every end point is looked up in a
+    dict keyed by its coordinates, so building the adjacency of the vertices and walking the rings are
+    both O(n) for n edges.
+
+    Repeated edges (in either direction) are used once. Overlapping collinear edges, as the edges between
+    every pair of collinear hull points returned by get_hull_edges, are reduced to the shortest ones:
+    at a vertex with more than two neighbours only the nearest neighbour in every direction is kept.
+"""
+
+
+def point_key(p) -> tuple:
+    return (p.x, p.y) if isinstance(p, Point) else (p[0], p[1])
+
+
+# Vertex rings of the edges
+#   Returns lists of the given point objects (the first one seen for every coordinates), every list
+#   being one closed ring in walking order, in no particular orientation.
+#   Raises ValueError if a vertex does not join exactly two edges.
+def assemble_rings(edges) -> list:
+
+    if isinstance(edges, np.ndarray):
+        edges = [(tuple(a), tuple(b)) for a, b in edges.reshape(-1, 2, 2).tolist()]
+
+    ids = {}
+    vertices = []
+    neighbours = []
+
+    for e in edges:
+
+        p, q = e[0], e[1]
+
+        # plain pairs are their own keys
+        a = p if type(p) is tuple and len(p) == 2 else point_key(p)
+        b = q if type(q) is tuple and len(q) == 2 else point_key(q)
+
+        ia = ids.setdefault(a, len(ids))
+
+        if ia == len(vertices):
+            vertices.append(p)
+            neighbours.append([])
+
+        ib = ids.setdefault(b, len(ids))
+
+        if ib == len(vertices):
+            vertices.append(q)
+            neighbours.append([])
+
+        # a repeated edge is already in the short neighbour list
+        if ia == ib or ib in neighbours[ia]:
+            continue
+
+        neighbours[ia].append(ib)
+        neighbours[ib].append(ia)
+
+    # the coordinates of every vertex, in the order of their ids
+    coords = list(ids)
+
+    remove_overlapping_edges(coords, neighbours)
+
+    visited = [False] * len(vertices)
+    rings = []
+
+    for start in range(len(vertices)):
+
+        if visited[start] or not neighbours[start]:
+            continue
+
+        ring = []
+        previous, v = -1, start
+
+        while not visited[v]:
+
+            around = neighbours[v]
+
+            if len(around) != 2:
+                raise ValueError('Vertex {} joins {} edges instead of 2.'.format(coords[v], len(around)))
+
+            visited[v] = True
+            ring.append(vertices[v])
+            previous, v = v, around[1] if around[0] == previous else around[0]
+
+        rings.append(ring)
+
+    return rings
+
+
+# drops every edge from a vertex to a farther neighbour in the same direction as a nearer one
+def remove_overlapping_edges(coords: list, neighbours: list):
+
+    removed = set()
+
+    for v, around in enumerate(neighbours):
+
+        if len(around) < 3:
+            continue
+
+        x, y = coords[v]
+        order = [around[i] for i in angular_order((x, y), [coords[u] for u in around])]
+
+        for u, w in zip(order, order[1:]):
+
+            (ux, uy), (wx, wy) = coords[u], coords[w]
+
+            # the order is by angle then distance, a run of one direction starts at its nearest neighbour
+            if orient2d(x, y, ux, uy, wx, wy) == 0 and (ux - x) * (wx - x) + (uy - y) * (wy - y) > 0:
+                removed.add((v, w) if v < w else (w, v))
+
+    for a, b in removed:
+        neighbours[a].remove(b)
+        neighbours[b].remove(a)
+
+
+def signed_area(ring: list) -> float:
+
+    coords = [point_key(p) for p in ring]
+    return sum(coords[i-1][0] * coords[i][1] - coords[i][0] * coords[i-1][1] for i in range(len(coords))) / 2
+
+
+# Vertices of the polygon bounded by the edges, starting from the point with min y and max x
+#   Straight vertices are kept unless remove_collinear is set.
+#   Raises ValueError if the edges do not form exactly one ring.
+def assemble_polygon(edges, clockwise: bool = True, remove_collinear: bool = False) -> list:
+
+    rings = assemble_rings(edges)
+
+    if len(rings) != 1:
+        raise ValueError('Edges form {} rings instead of 1.'.format(len(rings)))
+
+    ring = rings[0]
+
+    if (signed_area(ring) < 0) != clockwise:
+        ring.reverse()
+
+    if remove_collinear and len(ring) > 3:
+
+        coords = [point_key(p) for p in ring]
+        size = len(ring)
+
+        ring = [ring[i] for i in range(size) if orient2d(*coords[i-1], *coords[i], *coords[(i + 1) % size]) != 0]
+
+    coords = [point_key(p) for p in ring]
+    start = min(range(len(ring)), key=lambda i: (coords[i][1], -coords[i][0]))
+
+    return ring[start:] + ring[:start]
+
+
+if __name__ == '__main__':
+
+    e = [((0, 0), (2, 0)), ((2, 2), (0, 2)), ((2, 0), (4, 0)), ((0, 2), (0, 0)), ((4, 0), (2, 2)),
+         ((0, 0), (4, 0)), ((2, 0), (0, 0))]
+    print('edges: ', e)
+    print('polygon: ', assemble_polygon(e))
+    print('polygon without collinear vertices: ', assemble_polygon(e, remove_collinear=True))
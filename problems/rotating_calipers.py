@@ -0,0 +1,278 @@
+from math import hypot
+from math import pi
+
+import numpy as np
+
+from geometry_objects.point import Point
+from problems.convex_hull import as_point_array
+from problems.convex_hull import remove_collinear_vertices
+
+"""
+    Rotating calipers over convex hulls
+
+    Every measure takes the corners of a convex hull in either orientation, collinear corners allowed
+    (the output of convex_hull_graham_scan or convex_hull), and runs in O(h): for every edge the vertex
+    farthest from it and the extreme vertices along it only move forward around the hull.
+
+    hull_metrics_batch measures many hulls packed into one array (the output of
+    convex_hull_monotone_chain_batch) at once: the extreme vertex of a hull in a direction is found by a
+    binary search over the angles of its edge normals, done for every edge of every hull together.
+"""
+
+
+def cross(o: tuple, a: tuple, b: tuple) -> float:
+    return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+
+
+def distance(a: tuple, b: tuple) -> float:
+    return hypot(a[0] - b[0], a[1] - b[1])
+
+
+# counter clockwise corners of the hull without collinear ones, as tuples
+def prepare_hull(hull) -> list:
+
+    if isinstance(hull, np.ndarray):
+        hull = [tuple(p) for p in hull.reshape(-1, 2).tolist()]
+
+    hull = [(p.x, p.y) if isinstance(p, Point) else (p[0], p[1]) for p in hull]
+    hull = [p for i, p in enumerate(hull) if p != hull[i-1]] or hull[:1]
+    hull = remove_collinear_vertices(hull)
+
+    if len(hull) > 2 and sum(cross(hull[0], hull[i], hull[i+1]) for i in range(1, len(hull) - 1)) < 0:
+        hull = hull[::-1]
+
+    return hull
+
+
+# For every edge (i, i+1) of a counter clockwise hull with at least 3 corners, the indices
+#   (i, k, j, m): k the vertex farthest along the edge, j the vertex farthest from it, m the vertex
+#   farthest against it. The extreme vertex in a direction moves forward as the direction turns, so
+#   every pointer only moves forward and goes around the hull once.
+def caliper_positions(hull: list) -> list:
+
+    n = len(hull)
+    positions = []
+    k = 1
+
+    def along(i: int, a: int, b: int) -> float:
+
+        ex, ey = hull[(i + 1) % n][0] - hull[i][0], hull[(i + 1) % n][1] - hull[i][1]
+        return ex * (hull[b % n][0] - hull[a % n][0]) + ey * (hull[b % n][1] - hull[a % n][1])
+
+    for i in range(n):
+
+        a, b = hull[i], hull[(i + 1) % n]
+
+        while along(i, k, k + 1) > 0:
+            k += 1
+
+        j = k if i == 0 else j
+
+        while cross(a, b, hull[(j + 1) % n]) > cross(a, b, hull[j % n]):
+            j += 1
+
+        m = j if i == 0 else m
+
+        while along(i, m, m + 1) < 0:
+            m += 1
+
+        positions.append((i, k % n, j % n, m % n))
+
+    return positions
+
+
+# pairs of hull corners admitting parallel supporting lines
+def antipodal_pairs(hull) -> list:
+
+    hull = prepare_hull(hull)
+    n = len(hull)
+
+    if n < 2:
+        return []
+
+    if n == 2:
+        return [(hull[0], hull[1])]
+
+    pairs = set()
+
+    for i, k, j, m in caliper_positions(hull):
+
+        following = (i + 1) % n
+        pairs.update({(min(i, j), max(i, j)), (min(following, j), max(following, j))})
+
+        # an edge parallel to the edge i also pairs its other end point
+        if cross(hull[i], hull[following], hull[(j + 1) % n]) == cross(hull[i], hull[following], hull[j]):
+            j2 = (j + 1) % n
+            pairs.update({(min(i, j2), max(i, j2)), (min(following, j2), max(following, j2))})
+
+    return [(hull[a], hull[b]) for a, b in sorted(pairs) if a != b]
+
+
+# farthest pair of corners as (distance, p, q)
+def diameter(hull) -> tuple:
+
+    pairs = antipodal_pairs(hull)
+
+    if not pairs:
+        hull = prepare_hull(hull)
+        return (0.0, hull[0], hull[0]) if hull else (0.0, None, None)
+
+    p, q = max(pairs, key=lambda pair: distance(*pair))
+    return distance(p, q), p, q
+
+
+# smallest distance between two parallel supporting lines, as (width, edge start, edge end, opposite corner)
+def width(hull) -> tuple:
+
+    hull = prepare_hull(hull)
+
+    if len(hull) < 3:
+        return (0.0, hull[0], hull[-1], hull[0]) if hull else (0.0, None, None, None)
+
+    n = len(hull)
+    best = None
+
+    for i, k, j, m in caliper_positions(hull):
+
+        a, b = hull[i], hull[(i + 1) % n]
+        w = cross(a, b, hull[j]) / distance(a, b)
+
+        if best is None or w < best[0]:
+            best = (w, a, b, hull[j])
+
+    return best
+
+
+# enclosing rectangle with a side on the edge i, as (area, perimeter, counter clockwise corners)
+def edge_rectangle(hull: list, i: int, k: int, j: int, m: int) -> tuple:
+
+    n = len(hull)
+    a, b = hull[i], hull[(i + 1) % n]
+    length = distance(a, b)
+    ux, uy = (b[0] - a[0]) / length, (b[1] - a[1]) / length
+
+    low = ux * (hull[m][0] - a[0]) + uy * (hull[m][1] - a[1])
+    high = ux * (hull[k][0] - a[0]) + uy * (hull[k][1] - a[1])
+    height = cross(a, b, hull[j]) / length
+
+    corners = [
+        (a[0] + ux * low, a[1] + uy * low),
+        (a[0] + ux * high, a[1] + uy * high),
+        (a[0] + ux * high - uy * height, a[1] + uy * high + ux * height),
+        (a[0] + ux * low - uy * height, a[1] + uy * low + ux * height),
+    ]
+
+    return (high - low) * height, 2 * (high - low + height), corners
+
+
+def min_rectangle(hull, key: int) -> tuple:
+
+    hull = prepare_hull(hull)
+
+    if len(hull) < 3:
+        corners = [hull[0], hull[-1], hull[-1], hull[0]] if hull else []
+        return 0.0, 2 * distance(hull[0], hull[-1]) if hull else 0.0, corners
+
+    return min((edge_rectangle(hull, *position) for position in caliper_positions(hull)), key=lambda r: r[key])
+
+
+# minimum area enclosing rectangle, as (area, perimeter, counter clockwise corners)
+def min_area_rectangle(hull) -> tuple:
+    return min_rectangle(hull, 0)
+
+
+# minimum perimeter enclosing rectangle, as (area, perimeter, counter clockwise corners)
+def min_perimeter_rectangle(hull) -> tuple:
+    return min_rectangle(hull, 1)
+
+
+# Measures of many hulls at once
+#   The hull i consists of points[hull_indices[hull_offsets[i]:hull_offsets[i+1]]], in counter clockwise
+#   order without collinear corners, as returned by convex_hull_monotone_chain_batch. Returns a dict of
+#   arrays with one value per hull: diameter, width, min_area and min_perimeter.
+def hull_metrics_batch(points: np.ndarray, hull_indices: np.ndarray, hull_offsets: np.ndarray) -> dict:
+
+    points = as_point_array(points)
+    hull_offsets = np.asarray(hull_offsets, dtype=np.int64)
+
+    count = len(hull_offsets) - 1
+    sizes = np.diff(hull_offsets)
+    vertices = points[np.asarray(hull_indices, dtype=np.intp)]
+
+    metrics = {name: np.zeros(count) for name in ('diameter', 'width', 'min_area', 'min_perimeter')}
+
+    # segments and single points
+    small = np.flatnonzero(sizes == 2)
+    segment = np.hypot(*(vertices[hull_offsets[small] + 1] - vertices[hull_offsets[small]]).T)
+    metrics['diameter'][small] = segment
+    metrics['min_perimeter'][small] = 2 * segment
+
+    hulls = np.flatnonzero(sizes >= 3)
+
+    if not len(hulls):
+        return metrics
+
+    starts, sizes = hull_offsets[hulls], sizes[hulls]
+    edge_hull = np.repeat(np.arange(len(hulls)), sizes)
+    first = np.repeat(np.cumsum(sizes) - sizes, sizes)
+    local = np.arange(len(edge_hull)) - first
+
+    current = vertices[np.repeat(starts, sizes) + local]
+    following = vertices[np.repeat(starts, sizes) + (local + 1) % np.repeat(sizes, sizes)]
+    edges = following - current
+
+    # edge angles unwrapped to increase around every hull, shifted apart so all hulls share one sorted array
+    angles = np.arctan2(edges[:, 1], edges[:, 0])
+    turns = np.diff(angles, prepend=angles[:1]) % (2 * pi)
+    turns = np.where(turns > pi, 0.0, turns)
+    turns[local == 0] = 0.0
+
+    cumulative = np.cumsum(turns)
+    angles = angles[first] + cumulative - cumulative[first] + 8 * pi * edge_hull
+    normals = angles - pi / 2
+
+    # vertex extreme in the direction of the given angle, for every edge
+    def extreme(direction: np.ndarray) -> np.ndarray:
+
+        base = normals[first]
+        direction = base + (direction - base) % (2 * pi)
+        k = np.searchsorted(normals, direction) - first
+
+        return np.where(k >= np.repeat(sizes, sizes), 0, k)
+
+    def vertex(k: np.ndarray) -> np.ndarray:
+        return vertices[np.repeat(starts, sizes) + k % np.repeat(sizes, sizes)]
+
+    lengths = np.hypot(edges[:, 0], edges[:, 1])
+    u = edges / lengths[:, np.newaxis]
+
+    far = extreme(angles + pi / 2)
+    high = extreme(angles)
+    low = extreme(angles + pi)
+
+    heights = np.maximum.reduce([u[:, 0] * (vertex(far + s)[:, 1] - current[:, 1]) -
+                                 u[:, 1] * (vertex(far + s)[:, 0] - current[:, 0]) for s in (-1, 0, 1)])
+    extents = np.maximum.reduce([np.einsum('ij,ij->i', u, vertex(high + s) - current) for s in (-1, 0, 1)]) - \
+        np.minimum.reduce([np.einsum('ij,ij->i', u, vertex(low + s) - current) for s in (-1, 0, 1)])
+
+    # the farthest corners of the edge ends are the antipodal pairs, neighbours cover parallel edges
+    spans = np.maximum.reduce([np.hypot(*(vertex(far + s) - end).T) for s in (-1, 0, 1) for end in (current, following)])
+
+    reduce_starts = np.cumsum(sizes) - sizes
+    metrics['diameter'][hulls] = np.maximum.reduceat(spans, reduce_starts)
+    metrics['width'][hulls] = np.minimum.reduceat(heights, reduce_starts)
+    metrics['min_area'][hulls] = np.minimum.reduceat(heights * extents, reduce_starts)
+    metrics['min_perimeter'][hulls] = np.minimum.reduceat(2 * (heights + extents), reduce_starts)
+
+    return metrics
+
+
+if __name__ == '__main__':
+
+    h = [(0, 0), (4, 0), (5, 2), (3, 4), (0, 3)]
+    print('hull: ', h)
+    print('antipodal pairs: ', antipodal_pairs(h))
+    print('diameter: ', diameter(h))
+    print('width: ', width(h))
+    print('min area rectangle: ', min_area_rectangle(h))
+    print('min perimeter rectangle: ', min_perimeter_rectangle(h))
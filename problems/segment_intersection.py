@@ -0,0 +1,188 @@
+from fractions import Fraction
+from functools import cmp_to_key
+from heapq import heappop
+from heapq import heappush
+
+from geometry_objects.point import Point
+from geometry_objects.predicates import orient2d
+from geometry_objects.vector import Vector
+
+"""
+    All intersections of a set of line segments (Bentley-Ottmann, as in de Berg et al. chapter 2)
+
+    A horizontal sweep line moves downwards, stopping at the segment endpoints and the intersection
+    points found so far, which are kept in a priority queue. The status is the list of the segments
+    crossing the sweep line, ordered from left to right, and only neighbours in the status are tested
+    for intersection. Every event locates its segments in the status by a binary search with the
+    orientation predicate. Intersection points are computed as fractions, so event points are exact and
+    several segments through one point or overlapping segments are reported correctly.
+    Runs in O((n + k) log n) comparisons for n segments with k intersection points.
+"""
+
+
+def as_vector(segment) -> Vector:
+
+    if isinstance(segment, Vector):
+        return segment
+
+    return Vector(Point(*segment[0]), Point(*segment[1]))
+
+
+# sign of the orientation of (a, b, c), a and b being float points and c a float or a fraction point
+def side(ax: float, ay: float, bx: float, by: float, cx, cy) -> int:
+
+    if type(cx) is float and type(cy) is float:
+        return orient2d(ax, ay, bx, by, cx, cy)
+
+    ax, ay, bx, by, cx, cy = map(Fraction, (ax, ay, bx, by, cx, cy))
+    det = (bx - ax) * (cy - ay) - (by - ay) * (cx - ax)
+
+    return (det > 0) - (det < 0)
+
+
+# exact intersection point of the lines of two segments (ux, uy, lx, ly), None if they are parallel
+def line_intersection(s1: tuple, s2: tuple):
+
+    u1x, u1y, l1x, l1y = map(Fraction, s1)
+    u2x, u2y, l2x, l2y = map(Fraction, s2)
+
+    d1x, d1y = l1x - u1x, l1y - u1y
+    d2x, d2y = l2x - u2x, l2y - u2y
+
+    den = d1x * d2y - d1y * d2x
+
+    if den == 0:
+        return None
+
+    t = ((u2x - u1x) * d2y - (u2y - u1y) * d2x) / den
+    x, y = u1x + t * d1x, u1y + t * d1y
+
+    # floats keep the predicates on their fast path
+    return tuple(float(c) if float(c) == c else c for c in (x, y))
+
+
+# Generator of the intersection points of the segments, given as Vectors or pairs of points
+#   Yields ((x, y), indices) for every point shared by at least two segments, indices being the sorted
+#   indices of the segments through the point, in the order of decreasing y then increasing x.
+#   Collinear overlapping segments are reported at the upper end point of their overlap.
+def segment_intersections(segments: list):
+
+    vectors = [as_vector(s) for s in segments]
+    ends = []
+
+    # every segment as (upper x, upper y, lower x, lower y), upper being the end point processed first
+    for v in vectors:
+
+        a = (float(v.head.x), float(v.head.y))
+        b = (float(v.tail.x), float(v.tail.y))
+
+        if (a[1], -a[0]) < (b[1], -b[0]):
+            a, b = b, a
+
+        ends.append(a + b)
+
+    # event point (x, y) -> segments with it as upper end point, the queue holds (-y, x)
+    events = {}
+    queue = []
+
+    def add_event(x, y):
+
+        if (x, y) not in events:
+            events[(x, y)] = []
+            heappush(queue, (-y, x))
+
+    for i, (ux, uy, lx, ly) in enumerate(ends):
+
+        add_event(ux, uy)
+        events[(ux, uy)].append(i)
+        add_event(lx, ly)
+
+    status = []
+
+    # order just below the event point of segments through it, from left to right, horizontal ones last
+    def compare_below(i: int, j: int) -> int:
+
+        ux1, uy1, lx1, ly1 = map(Fraction, ends[i])
+        ux2, uy2, lx2, ly2 = map(Fraction, ends[j])
+
+        det = (lx1 - ux1) * (ly2 - uy2) - (ly1 - uy1) * (lx2 - ux2)
+
+        if det != 0:
+            return -1 if det > 0 else 1
+
+        return (i > j) - (i < j)
+
+    def check_neighbours(i: int, j: int, px, py):
+
+        if not vectors[i].do_intersect(vectors[j]):
+            return
+
+        point = line_intersection(ends[i], ends[j])
+
+        if point is None:
+            return
+
+        x, y = point
+
+        # only points after the current event
+        if y < py or (y == py and x > px):
+            add_event(x, y)
+
+    while queue:
+
+        key = heappop(queue)
+        py, px = -key[0], key[1]
+        upper = events.pop((px, py))
+
+        # the status is ordered by the side of the event point: segments left of it, through it, right of it
+        lo, hi = 0, len(status)
+
+        while lo < hi:
+
+            mid = (lo + hi) // 2
+            ux, uy, lx, ly = ends[status[mid]]
+
+            if side(ux, uy, lx, ly, px, py) > 0:
+                lo = mid + 1
+            else:
+                hi = mid
+
+        hi = lo
+
+        while hi < len(status) and side(*ends[status[hi]], px, py) == 0:
+            hi += 1
+
+        through = status[lo:hi]
+
+        if len(through) + len(upper) > 1:
+            yield (float(px), float(py)), sorted(through + upper)
+
+        # segments ending at the event point leave the status, the others are reordered below it
+        below = [s for s in through + upper if (ends[s][2], ends[s][3]) != (px, py)]
+        below.sort(key=cmp_to_key(compare_below))
+
+        status[lo:hi] = below
+
+        if not below:
+
+            if 0 < lo < len(status):
+                check_neighbours(status[lo-1], status[lo], px, py)
+
+            continue
+
+        if lo > 0:
+            check_neighbours(status[lo-1], status[lo], px, py)
+
+        end = lo + len(below)
+
+        if end < len(status):
+            check_neighbours(status[end-1], status[end], px, py)
+
+
+if __name__ == '__main__':
+
+    s = [((0, 0), (4, 4)), ((0, 4), (4, 0)), ((2, 0), (2, 5)), ((3, 3), (6, 3)), ((5, 3), (8, 3)), ((7, 0), (9, 1))]
+    print('segments: ', s)
+
+    for point, indices in segment_intersections(s):
+        print('intersection: ', point, indices)
@@ -1,5 +1,6 @@
 from geometry_objects.point import Point
 from problems.convex_hull import find_centroid
+from problems.polygon_assembly import assemble_polygon
 from problems.simple_poly import simple_poly
 
 """
@@ -20,18 +21,6 @@ def sort_cw(edges) -> list:
     return simple_poly(list(vertices_map))
 
 
-def traverse_map(vertices_map: dict):
-
-    sorted_list = []
-    prev_p = vertices_map[0]
-
-    for i in range(len(vertices_map)-1):
-        sorted_list.append(prev_p)
-        prev_p = vertices_map[prev_p]
-
-    return sorted_list
-
-
 def orientate_edges(edges):
 
     centroid = find_centroid()
@@ -50,7 +39,4 @@ def orientate_edges(edges):
 
 
 def sort_cw_linear(edges) -> list:
-
-    vertices_map = {}
-    # construct vertices map
-    return traverse_map(vertices_map)
+    return assemble_polygon(edges, clockwise=True)
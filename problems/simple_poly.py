@@ -1,5 +1,6 @@
+from geometry_objects.angular_order import angular_order
 from geometry_objects.point import Point
-from geometry_objects.vector import Vector
+from geometry_objects.predicates import orient2d
 
 
 def simple_poly(vertices: list) -> list:
@@ -10,16 +11,17 @@ def simple_poly(vertices: list) -> list:
     # swap with first point
     vertices[0], vertices[index] = vertices[index], vertices[0]
 
-    vertices = sorted(vertices, key=lambda x: (
-        Vector(Point(*vertices[0]), Point(*x)).slope(), Point(*vertices[0]).euclidean_distance(Point(*x))
-    ))
+    # sort by angle around the first point, then by distance from it
+    vertices = [vertices[i] for i in angular_order(vertices[0], vertices)]
 
     bottom_most = Point(*vertices[0])
+    bx, by = bottom_most.x, bottom_most.y
 
     k = -1
 
-    while Point(*vertices[k]) != bottom_most and \
-        Vector(bottom_most, Point(*vertices[k])).slope() == Vector(bottom_most, Point(*vertices[k-1])).slope():
+    # the points on the last ray are connected back in the order of decreasing distance
+    while Point(*vertices[k]) != bottom_most and Point(*vertices[k-1]) != bottom_most and \
+            orient2d(bx, by, vertices[k][0], vertices[k][1], vertices[k-1][0], vertices[k-1][1]) == 0:
 
         k -= 1
 
@@ -0,0 +1,425 @@
+from math import floor
+
+import numpy as np
+
+from geometry_objects.angular_order import angular_order
+from geometry_objects.point import Point
+from geometry_objects.polygon_ring import PolygonRing
+from geometry_objects.predicates import orient2d
+
+"""
+    Triangulation of simple polygons
+
+    Both triangulations return an (M, 3) array of indices into the given vertices, every triangle
+    counter clockwise, M being n - 2 for n distinct vertices (flat triangles over collinear vertices included).
+
+    triangulate_monotone splits the polygon into y-monotone pieces with a downward sweep (de Berg et al.
+    chapter 3) and triangulates every piece with the stack algorithm, O(n log n).
+    triangulate_ear_clipping clips ears off a PolygonRing. An ear must not contain a reflex vertex, and
+    only the reflex vertices in the grid cells under the candidate ear are tested, so a test is O(1) on
+    average for polygons with edges of similar length instead of O(n).
+"""
+
+
+def polygon_coordinates(vertices) -> list:
+
+    if isinstance(vertices, np.ndarray):
+        return [(float(x), float(y)) for x, y in vertices.reshape(-1, 2).tolist()]
+
+    return [(float(p.x), float(p.y)) if isinstance(p, Point) else (float(p[0]), float(p[1])) for p in vertices]
+
+
+# counter clockwise coordinates without consecutive duplicates, and the input index of every one of them
+def normalized_polygon(vertices) -> tuple:
+
+    points = polygon_coordinates(vertices)
+    indices = [i for i in range(len(points)) if points[i] != points[i-1]] if len(points) > 1 else [0] * len(points)
+
+    if len(indices) < 3:
+        raise ValueError('polygon must have at least 3 distinct vertices')
+
+    points = [points[i] for i in indices]
+    area = sum(points[i-1][0] * points[i][1] - points[i][0] * points[i-1][1] for i in range(len(points)))
+
+    if area < 0:
+        points, indices = points[::-1], indices[::-1]
+
+    return points, indices
+
+
+def triangle_array(triangles: list, indices: list) -> np.ndarray:
+
+    triangles = np.array(triangles, dtype=np.intp).reshape(-1, 3)
+    return np.asarray(indices, dtype=np.intp)[triangles]
+
+
+# p above q: higher, or as high and more to the left (the sweep order)
+def above(p: tuple, q: tuple) -> bool:
+    return p[1] > q[1] or (p[1] == q[1] and p[0] < q[0])
+
+
+def triangulate(vertices) -> np.ndarray:
+    return triangulate_monotone(vertices)
+
+
+def triangulate_monotone(vertices) -> np.ndarray:
+
+    points, indices = normalized_polygon(vertices)
+    triangles = []
+
+    for piece in monotone_partition_indices(points):
+        triangles.extend(triangulate_monotone_piece(points, piece))
+
+    return triangle_array(triangles, indices)
+
+
+# pieces of the polygon as lists of vertex indices in counter clockwise order, every piece y-monotone
+def monotone_partition(vertices) -> list:
+
+    points, indices = normalized_polygon(vertices)
+    return [[indices[i] for i in piece] for piece in monotone_partition_indices(points)]
+
+
+def monotone_partition_indices(points: list) -> list:
+    return split_by_diagonals(points, monotone_diagonals(points))
+
+
+# diagonals splitting a counter clockwise polygon into y-monotone pieces
+def monotone_diagonals(points: list) -> list:
+
+    n = len(points)
+    diagonals = []
+
+    # status: edges (i, i+1) with the polygon interior to their right, ordered from left to right
+    status = []
+    helper = {}
+    merge = set()
+
+    def right_of_edge(e: int, q: tuple) -> bool:
+
+        a, b = points[e], points[(e + 1) % n]
+        return orient2d(a[0], a[1], b[0], b[1], q[0], q[1]) > 0
+
+    # number of status edges left of q
+    def position(q: tuple) -> int:
+
+        lo, hi = 0, len(status)
+
+        while lo < hi:
+
+            mid = (lo + hi) // 2
+
+            if right_of_edge(status[mid], q):
+                lo = mid + 1
+            else:
+                hi = mid
+
+        return lo
+
+    def insert_edge(e: int, h: int):
+
+        status.insert(position(points[e]), e)
+        helper[e] = h
+
+    def remove_edge(e: int, v: int):
+
+        if helper[e] in merge:
+            diagonals.append((v, helper[e]))
+
+        status.remove(e)
+
+    def update_left_edge(v: int, split: bool = False):
+
+        e = status[position(points[v]) - 1]
+
+        if split or helper[e] in merge:
+            diagonals.append((v, helper[e]))
+
+        helper[e] = v
+
+    order = sorted(range(n), key=lambda i: (-points[i][1], points[i][0]))
+
+    for v in order:
+
+        prev_v, next_v = (v - 1) % n, (v + 1) % n
+        p, q, r = points[prev_v], points[v], points[next_v]
+        convex = orient2d(p[0], p[1], q[0], q[1], r[0], r[1]) > 0
+
+        if above(q, p) and above(q, r):
+
+            # start vertex, or split vertex
+            if not convex:
+                update_left_edge(v, split=True)
+
+            insert_edge(v, v)
+
+        elif above(p, q) and above(r, q):
+
+            # end vertex, or merge vertex
+            remove_edge(prev_v, v)
+
+            if not convex:
+                update_left_edge(v)
+                merge.add(v)
+
+        elif above(p, q):
+
+            # regular vertex with the interior to its right
+            remove_edge(prev_v, v)
+            insert_edge(v, v)
+
+        else:
+            update_left_edge(v)
+
+    return diagonals
+
+
+# faces of the polygon cut along the diagonals, as lists of vertex indices in counter clockwise order
+def split_by_diagonals(points: list, diagonals: list) -> list:
+
+    n = len(points)
+
+    if not diagonals:
+        return [list(range(n))]
+
+    # neighbours in counter clockwise order around the vertices with a diagonal
+    neighbours = {}
+
+    for a, b in diagonals:
+        neighbours.setdefault(a, [(a - 1) % n, (a + 1) % n]).append(b)
+        neighbours.setdefault(b, [(b - 1) % n, (b + 1) % n]).append(a)
+
+    for v, around in neighbours.items():
+        neighbours[v] = [around[i] for i in angular_order(points[v], [points[u] for u in around])]
+
+    # the face left of u -> w continues with the edge from w that is next clockwise from w -> u
+    def following(u: int, w: int) -> int:
+
+        around = neighbours.get(w)
+
+        if around is None:
+            return (w + 1) % n
+
+        return around[around.index(u) - 1]
+
+    half_edges = [(i, (i + 1) % n) for i in range(n)] + diagonals + [(b, a) for a, b in diagonals]
+    used = set()
+    faces = []
+
+    for edge in half_edges:
+
+        if edge in used:
+            continue
+
+        face = []
+        u, w = edge
+
+        while (u, w) not in used:
+            used.add((u, w))
+            face.append(u)
+            u, w = w, following(u, w)
+
+        faces.append(face)
+
+    return faces
+
+
+# triangles of a counter clockwise y-monotone polygon given by vertex indices
+def triangulate_monotone_piece(points: list, piece: list) -> list:
+
+    size = len(piece)
+
+    if size == 3:
+        return [tuple(piece)]
+
+    top = min(range(size), key=lambda k: (-points[piece[k]][1], points[piece[k]][0]))
+    bottom = min(range(size), key=lambda k: (points[piece[k]][1], -points[piece[k]][0]))
+
+    # going counter clockwise from the top vertex descends the left chain
+    left = set()
+    k = (top + 1) % size
+
+    while k != bottom:
+        left.add(piece[k])
+        k = (k + 1) % size
+
+    order = sorted(piece, key=lambda i: (-points[i][1], points[i][0]))
+    triangles = []
+
+    def add(a: int, b: int, c: int):
+
+        pa, pb, pc = points[a], points[b], points[c]
+
+        if orient2d(pa[0], pa[1], pb[0], pb[1], pc[0], pc[1]) < 0:
+            b, c = c, b
+
+        triangles.append((a, b, c))
+
+    stack = [order[0], order[1]]
+
+    for u in order[2:-1]:
+
+        if (u in left) != (stack[-1] in left):
+
+            # u sees every vertex on the stack
+            previous = stack[-1]
+
+            while len(stack) > 1:
+                top_vertex = stack.pop()
+                add(u, top_vertex, stack[-1])
+
+            stack = [previous, u]
+
+        else:
+
+            last = stack.pop()
+
+            while stack:
+
+                a, b = points[stack[-1]], points[last]
+                c = points[u]
+
+                # the diagonal u - stack[-1] is inside when the polygon turns left at last
+                ori = orient2d(a[0], a[1], b[0], b[1], c[0], c[1]) if u in left else \
+                    orient2d(c[0], c[1], b[0], b[1], a[0], a[1])
+
+                if ori <= 0:
+                    break
+
+                add(u, last, stack[-1])
+                last = stack.pop()
+
+            stack.append(last)
+            stack.append(u)
+
+    u = order[-1]
+
+    while len(stack) > 1:
+        top_vertex = stack.pop()
+        add(u, top_vertex, stack[-1])
+
+    return triangles
+
+
+def triangulate_ear_clipping(vertices) -> np.ndarray:
+
+    points, indices = normalized_polygon(vertices)
+    n = len(points)
+
+    ring = PolygonRing(points)
+    triangles = []
+
+    def turn(v: int) -> int:
+
+        (px, py), (x, y), (nx, ny) = ring.xy(ring.previous(v)), ring.xy(v), ring.xy(ring.next(v))
+        return orient2d(px, py, x, y, nx, ny)
+
+    # vertices can only turn from reflex to convex by clipping, the initial reflex ones are enough
+    reflex = [v for v in range(n) if turn(v) <= 0]
+
+    # grid of the reflex vertices with cells about as large as an edge, so an ear spans only a few cells
+    size = sum(abs(points[i][0] - points[i-1][0]) + abs(points[i][1] - points[i-1][1]) for i in range(n)) / n
+    size = size if size > 0 else 1.0
+    cells = {}
+
+    def cell(r: int) -> tuple:
+        return floor(points[r][0] / size), floor(points[r][1] / size)
+
+    for r in reflex:
+        cells.setdefault(cell(r), set()).add(r)
+
+    reflex_left = set(reflex)
+
+    # clipped vertices and vertices which turned convex never block an ear again
+    def discard(r: int):
+
+        if r in cells.get(cell(r), ()):
+            cells[cell(r)].discard(r)
+            reflex_left.discard(r)
+
+    def candidates(box: tuple):
+
+        ix0, iy0, ix1, iy1 = floor(box[0] / size), floor(box[1] / size), floor(box[2] / size), floor(box[3] / size)
+
+        if (ix1 - ix0 + 1) * (iy1 - iy0 + 1) > len(cells):
+            return list(reflex_left)
+
+        return [r for ix in range(ix0, ix1 + 1) for iy in range(iy0, iy1 + 1) for r in cells.get((ix, iy), ())]
+
+    def is_ear(p: int, v: int, q: int) -> bool:
+
+        a, b, c = ring.xy(p), ring.xy(v), ring.xy(q)
+
+        if orient2d(a[0], a[1], b[0], b[1], c[0], c[1]) <= 0:
+            return False
+
+        box = (min(a[0], b[0], c[0]), min(a[1], b[1], c[1]), max(a[0], b[0], c[0]), max(a[1], b[1], c[1]))
+
+        for r in candidates(box):
+
+            x, y = points[r]
+
+            if not (box[0] <= x <= box[2] and box[1] <= y <= box[3]) or r == p or r == v or r == q:
+                continue
+
+            if turn(r) > 0:
+                discard(r)
+                continue
+
+            # a reflex vertex in the closed triangle, other than a copy of its corners
+            if orient2d(a[0], a[1], b[0], b[1], x, y) >= 0 and orient2d(b[0], b[1], c[0], c[1], x, y) >= 0 \
+                    and orient2d(c[0], c[1], a[0], a[1], x, y) >= 0 and (x, y) not in (a, b, c):
+                return False
+
+        return True
+
+    remaining = n
+    ear = 0
+    failures = 0
+
+    while remaining > 3:
+
+        p, q = ring.previous(ear), ring.next(ear)
+
+        if is_ear(p, ear, q):
+
+            triangles.append((p, ear, q))
+            ring.remove(ear)
+            discard(ear)
+            remaining -= 1
+            failures = 0
+
+            # skipping a vertex keeps the ears small instead of fanning out of p
+            ear = ring.next(q)
+            continue
+
+        ear = q
+        failures += 1
+
+        if failures < remaining:
+            continue
+
+        # a whole round without an ear: a flat vertex is clipped as a flat triangle
+        flat = next((v for v in ring.ring(ear) if turn(v) == 0), None)
+
+        if flat is None:
+            raise ValueError('polygon is not simple')
+
+        triangles.append((ring.previous(flat), flat, ring.next(flat)))
+        ear = ring.next(flat)
+        ring.remove(flat)
+        discard(flat)
+        remaining -= 1
+        failures = 0
+
+    triangles.append((ring.previous(ear), ear, ring.next(ear)))
+
+    return triangle_array(triangles, indices)
+
+
+if __name__ == '__main__':
+
+    polygon = [(0, 0), (4, 0), (4, 3), (2, 1), (0, 3)]
+    print('polygon: ', polygon)
+    print('monotone triangulation: ', triangulate_monotone(polygon).tolist())
+    print('ear clipping triangulation: ', triangulate_ear_clipping(polygon).tolist())
@@ -0,0 +1,171 @@
+import importlib
+import sys
+from contextlib import contextmanager
+from time import perf_counter
+
+"""
+    Opt-in call counters and timers for the geometry kernel
+
+    Enabling the instrumentation swaps the listed primitives for counting wrappers: on their owner
+    (module or class) and in every loaded module that imported them by name. Disabling puts the
+    original objects back, so the kernel runs untouched, at full speed, while instrumentation is off.
+
+    Times are inclusive: a call of Point.classify also counts towards Point.orientation and orient2d.
+"""
+
+
+# (owner module, attribute path, counter name)
+PRIMITIVES = [
+    ('geometry_objects.predicates', 'orient2d', 'orient2d'),
+    ('geometry_objects.predicates', 'orientation_many', 'orientation_many'),
+    ('berg_problems.chapter_1', 'orientation', 'orientation'),
+    ('berg_problems.chapter_1', 'slope', 'slope'),
+    ('geometry_objects.point', 'Point.orientation', 'Point.orientation'),
+    ('geometry_objects.point', 'Point.classify', 'Point.classify'),
+    ('geometry_objects.point', 'Point.slope', 'Point.slope'),
+    ('geometry_objects.point', 'Point.__init__', 'Point.__init__'),
+    ('geometry_objects.vector', 'Vector.angle_between', 'Vector.angle_between'),
+    ('geometry_objects.vector', 'Vector.slope', 'Vector.slope'),
+    ('geometry_objects.vector', 'Vector.__init__', 'Vector.__init__'),
+    ('problems.simple_poly', 'simple_poly', 'sort.simple_poly'),
+    ('berg_problems.chapter_1', 'simple_polygon_over_points', 'sort.simple_polygon_over_points'),
+    ('problems.convex_hull', 'find_tangent_point_index', 'tangent.find_tangent_point_index'),
+    ('berg_problems.chapter_1', 'get_tangents', 'tangent.get_tangents'),
+]
+
+
+class Counter:
+
+    __slots__ = ('calls', 'seconds')
+
+    def __init__(self):
+
+        self.calls = 0
+        self.seconds = 0.0
+
+
+class Profile:
+
+    def __init__(self):
+        self.counters = {}
+
+    def counter(self, name: str) -> Counter:
+        return self.counters.setdefault(name, Counter())
+
+    def as_dict(self) -> dict:
+        return {name: {'calls': c.calls, 'seconds': c.seconds} for name, c in self.counters.items() if c.calls}
+
+    def report(self) -> str:
+
+        lines = ['{:<42} {:>12} {:>12}'.format('primitive', 'calls', 'seconds')]
+
+        for name, c in sorted(self.counters.items(), key=lambda item: -item[1].seconds):
+
+            if c.calls:
+                lines.append('{:<42} {:>12} {:>12.6f}'.format(name, c.calls, c.seconds))
+
+        return '\n'.join(lines)
+
+
+# (owner, attribute name, original value as stored on the owner) of every swapped reference
+_patches = []
+_active = None
+
+
+def wrap(function, counter: Counter):
+
+    def counted(*args, **kwargs):
+
+        start = perf_counter()
+
+        try:
+            return function(*args, **kwargs)
+
+        finally:
+            counter.calls += 1
+            counter.seconds += perf_counter() - start
+
+    counted.__wrapped__ = function
+    counted.__name__ = getattr(function, '__name__', 'counted')
+
+    return counted
+
+
+def patch(owner, name: str, value) -> None:
+
+    _patches.append((owner, name, owner.__dict__[name] if isinstance(owner, type) else getattr(owner, name)))
+    setattr(owner, name, value)
+
+
+def enable(profile: Profile = None) -> Profile:
+
+    global _active
+
+    if _active is not None:
+        raise RuntimeError('Kernel instrumentation is already enabled.')
+
+    profile = profile or Profile()
+
+    for module_name, path, counter_name in PRIMITIVES:
+
+        owner = importlib.import_module(module_name)
+        *classes, attribute = path.split('.')
+
+        for class_name in classes:
+            owner = getattr(owner, class_name)
+
+        raw = owner.__dict__[attribute]
+        is_static = isinstance(raw, staticmethod)
+        function = raw.__func__ if is_static else raw
+        wrapper = wrap(function, profile.counter(counter_name))
+
+        patch(owner, attribute, staticmethod(wrapper) if is_static else wrapper)
+
+        if classes:
+            continue
+
+        # modules which imported the function by name hold their own reference to it
+        for module in list(sys.modules.values()):
+
+            if module is not owner and getattr(module, '__dict__', None) is not None \
+                    and module.__dict__.get(attribute) is function:
+                patch(module, attribute, wrapper)
+
+    _active = profile
+    return profile
+
+
+def disable() -> Profile:
+
+    global _active
+
+    while _patches:
+        owner, name, value = _patches.pop()
+        setattr(owner, name, value)
+
+    profile, _active = _active, None
+    return profile
+
+
+@contextmanager
+def profiled(profile: Profile = None):
+
+    profile = enable(profile)
+
+    try:
+        yield profile
+
+    finally:
+        disable()
+
+
+# runs a single hull / polygon call with instrumentation on, returns the result and its profile
+#   The call itself is counted as 'call.<function name>', which gives the total to compare against.
+def profile_call(function, *args, **kwargs) -> tuple:
+
+    with profiled() as profile:
+
+        counted = wrap(function, profile.counter('call.' + getattr(function, '__name__', 'function')))
+        result = counted(*args, **kwargs)
+
+    return result, profile
@@ -0,0 +1,258 @@
+import asyncio
+from collections import OrderedDict
+from threading import Lock
+
+import numpy as np
+
+from data_structures.polygon_index import PolygonIndex
+from problems.convex_hull import as_point_array
+from problems.convex_hull import convex_hull_monotone_chain_batch
+
+"""
+    asyncio front end micro-batching hull and containment requests
+
+    Every request is parked on a future. The first request of a batch starts a timer of max_latency
+    seconds; when it fires, or as soon as max_batch_size requests are waiting, the whole batch is handed
+    to a handler running in an executor (the default thread pool of the loop unless one is given, a
+    process pool works as well) and every future is resolved with its own result.
+
+    Hull requests are packed into one array with offsets for convex_hull_monotone_chain_batch.
+    Containment requests are grouped by polygon and every polygon is tested against the points of all
+    its requests at once, with a PolygonIndex cached per polygon (per process).
+
+    Inputs are converted and checked when a request is made, so a malformed request fails on its own
+    instead of failing its batch.
+"""
+
+
+DEFAULT_MAX_BATCH_SIZE: int = 256
+
+# seconds the first request of a batch waits for others
+DEFAULT_MAX_LATENCY: float = 0.002
+
+# number of polygon indexes kept by every process
+INDEX_CACHE_SIZE: int = 128
+
+index_cache = OrderedDict()
+index_cache_lock = Lock()
+
+
+class MicroBatcher:
+
+    # handler takes a list of requests and returns the list of their results, a result being an
+    #   exception fails only the request it belongs to
+    def __init__(self, handler, max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+                 max_latency: float = DEFAULT_MAX_LATENCY, executor=None):
+
+        if max_batch_size < 1:
+            raise ValueError('max_batch_size must be at least 1')
+
+        self.handler = handler
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency
+        self.executor = executor
+
+        self.pending = []
+        self.timer = None
+        self.running = set()
+
+        self.batches = 0
+        self.requests = 0
+
+    async def submit(self, request):
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        self.pending.append((request, future))
+
+        if len(self.pending) >= self.max_batch_size:
+            self.flush()
+
+        elif self.timer is None:
+            self.timer = loop.call_later(self.max_latency, self.flush)
+
+        return await future
+
+    # sends the waiting requests as one batch
+    def flush(self):
+
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+
+        if not self.pending:
+            return
+
+        batch, self.pending = self.pending, []
+
+        task = asyncio.get_running_loop().create_task(self.run(batch))
+        self.running.add(task)
+        task.add_done_callback(self.running.discard)
+
+    async def run(self, batch: list):
+
+        self.batches += 1
+        self.requests += len(batch)
+
+        try:
+            loop = asyncio.get_running_loop()
+            results = await loop.run_in_executor(self.executor, self.handler, [request for request, _ in batch])
+
+        except Exception as error:
+            results = [error] * len(batch)
+
+        for (_, future), result in zip(batch, results):
+
+            # the caller may have been cancelled while the batch was running
+            if future.done():
+                continue
+
+            if isinstance(result, Exception):
+                future.set_exception(result)
+
+            else:
+                future.set_result(result)
+
+    # sends the waiting requests and waits for every batch in flight
+    async def drain(self):
+
+        self.flush()
+
+        if self.running:
+            await asyncio.gather(*self.running)
+
+
+# hulls of a batch of (N, 2) arrays, as (H, 2) arrays of their corners in counter clockwise order
+def hull_batch(requests: list) -> list:
+
+    offsets = np.zeros(len(requests) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(points) for points in requests])
+
+    points = np.concatenate(requests) if requests else np.empty((0, 2), dtype=np.float64)
+    indices, hull_offsets = convex_hull_monotone_chain_batch(points, offsets)
+
+    return [points[indices[hull_offsets[i]:hull_offsets[i+1]]] for i in range(len(requests))]
+
+
+def polygon_index(polygon: np.ndarray) -> PolygonIndex:
+
+    key = polygon.tobytes()
+
+    with index_cache_lock:
+
+        index = index_cache.get(key)
+
+        if index is not None:
+            index_cache.move_to_end(key)
+            return index
+
+    index = PolygonIndex(polygon)
+
+    with index_cache_lock:
+
+        index_cache[key] = index
+
+        while len(index_cache) > INDEX_CACHE_SIZE:
+            index_cache.popitem(last=False)
+
+    return index
+
+
+# containment of a batch of (polygon, points) requests, as boolean arrays
+def contains_batch(requests: list) -> list:
+
+    groups = {}
+
+    for i, (polygon, points) in enumerate(requests):
+        groups.setdefault(polygon.tobytes(), []).append(i)
+
+    results = [None] * len(requests)
+
+    for members in groups.values():
+
+        try:
+            index = polygon_index(requests[members[0]][0])
+
+        except ValueError as error:
+
+            for i in members:
+                results[i] = error
+
+            continue
+
+        points = [requests[i][1] for i in members]
+        inside = index.contains(np.concatenate(points))
+        start = 0
+
+        for i, p in zip(members, points):
+            results[i] = inside[start:start + len(p)]
+            start += len(p)
+
+    return results
+
+
+class GeometryService:
+
+    def __init__(self, max_batch_size: int = DEFAULT_MAX_BATCH_SIZE, max_latency: float = DEFAULT_MAX_LATENCY,
+                 executor=None):
+
+        self.hulls = MicroBatcher(hull_batch, max_batch_size, max_latency, executor)
+        self.containment = MicroBatcher(contains_batch, max_batch_size, max_latency, executor)
+
+    async def __aenter__(self) -> 'GeometryService':
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    # corners of the hull of the points as an (H, 2) array, counter clockwise from the lexicographically
+    #   smallest one, as convex_hull_monotone_chain
+    async def convex_hull(self, points) -> np.ndarray:
+
+        points = as_point_array(points) if len(points) else np.empty((0, 2), dtype=np.float64)
+        return await self.hulls.submit(np.ascontiguousarray(points))
+
+    # boolean array telling for every point whether it is in the polygon, boundary included (as Point.in_poly)
+    async def contains(self, polygon, points) -> np.ndarray:
+
+        polygon = np.ascontiguousarray(as_point_array(polygon))
+        points = as_point_array(points) if len(points) else np.empty((0, 2), dtype=np.float64)
+
+        return await self.containment.submit((polygon, points))
+
+    async def contains_point(self, polygon, point) -> bool:
+        return bool((await self.contains(polygon, [point]))[0])
+
+    async def close(self):
+
+        await self.hulls.drain()
+        await self.containment.drain()
+
+    def stats(self) -> dict:
+
+        return {
+            'hull_batches': self.hulls.batches,
+            'hull_requests': self.hulls.requests,
+            'containment_batches': self.containment.batches,
+            'containment_requests': self.containment.requests,
+        }
+
+
+async def main():
+
+    rng = np.random.default_rng(0)
+    square = [(0, 0), (1, 0), (1, 1), (0, 1)]
+
+    async with GeometryService(max_batch_size=64) as service:
+
+        hulls = await asyncio.gather(*(service.convex_hull(rng.random((100, 2))) for _ in range(200)))
+        inside = await asyncio.gather(*(service.contains_point(square, rng.random(2) * 2) for _ in range(200)))
+
+        print('hull sizes: ', [len(h) for h in hulls[:10]])
+        print('points inside: ', sum(inside))
+        print('stats: ', service.stats())
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
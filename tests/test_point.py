@@ -0,0 +1,46 @@
+import unittest
+
+from geometry_objects.point import Node
+from geometry_objects.point import Point
+from geometry_objects.point import Vertex
+
+"""
+    Slotted points and linked vertices
+"""
+
+
+class TestSlots(unittest.TestCase):
+
+    def test_point_and_vertex_have_no_instance_dict(self):
+
+        self.assertFalse(hasattr(Point(1, 2), '__dict__'))
+        self.assertFalse(hasattr(Vertex(1, 2), '__dict__'))
+        self.assertFalse(hasattr(Node(), '__dict__'))
+
+    def test_vertex_links(self):
+
+        a = Vertex(0, 0)
+        b = a.insert(Vertex(1, 0))
+        c = b.insert(Vertex(0, 1))
+
+        self.assertEqual([a.next(), b.next(), c.next()], [b, c, a])
+        self.assertEqual([a.previous(), b.previous(), c.previous()], [c, a, b])
+
+        b.remove()
+
+        self.assertIs(a.next(), c)
+        self.assertIs(c.previous(), a)
+        self.assertIs(b.next(), b)
+
+    def test_node_links(self):
+
+        a = Node()
+        b = a.insert(Node())
+
+        self.assertIs(a.next(), b)
+        self.assertIs(b.next(), a)
+        self.assertIs(a.previous(), b)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+import asyncio
+import unittest
+
+import numpy as np
+
+from geometry_objects.point import Point
+from problems.convex_hull import convex_hull_monotone_chain
+from service.batching import GeometryService
+
+"""
+    GeometryService driven in process, on the default thread pool of the test loop
+"""
+
+
+# clockwise, as Point.in_poly expects
+HEXAGON = [(0, 0), (-1, 2), (0, 4), (3, 4), (4, 2), (3, 0)]
+
+# seconds any single await may take before the test fails instead of hanging
+TIMEOUT: float = 10.0
+
+
+class TestGeometryService(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.rng = np.random.default_rng(0)
+
+    async def test_stats_count_batches_and_requests(self):
+
+        async with GeometryService(max_batch_size=4, max_latency=0.05) as service:
+
+            point_sets = [self.rng.random((20, 2)) for _ in range(10)]
+            await asyncio.wait_for(asyncio.gather(*(service.convex_hull(p) for p in point_sets)), TIMEOUT)
+
+        self.assertEqual(service.stats(), {
+            'hull_batches': 3,
+            'hull_requests': 10,
+            'containment_batches': 0,
+            'containment_requests': 0,
+        })
+
+    # with a latency far beyond the timeout only reaching max_batch_size can send the batch
+    async def test_full_batch_is_sent_without_waiting(self):
+
+        service = GeometryService(max_batch_size=3, max_latency=3600)
+
+        point_sets = [self.rng.random((10, 2)) for _ in range(3)]
+        await asyncio.wait_for(asyncio.gather(*(service.convex_hull(p) for p in point_sets)), TIMEOUT)
+
+        self.assertEqual(service.stats()['hull_batches'], 1)
+        await service.close()
+
+    # a batch far below max_batch_size is sent once max_latency has passed
+    async def test_partial_batch_is_sent_after_latency(self):
+
+        service = GeometryService(max_batch_size=1000, max_latency=0.01)
+
+        inside = await asyncio.wait_for(service.contains_point(HEXAGON, (1, 1)), TIMEOUT)
+
+        self.assertTrue(inside)
+        self.assertEqual(service.stats()['containment_batches'], 1)
+        await service.close()
+
+    async def test_bad_polygon_fails_only_its_request(self):
+
+        async with GeometryService(max_batch_size=10, max_latency=0.05) as service:
+
+            flat = [(0, 0), (1, 1), (2, 2)]
+            results = await asyncio.wait_for(asyncio.gather(
+                service.contains(flat, [(1, 1)]),
+                service.contains(HEXAGON, [(1, 1), (10, 10)]),
+                service.convex_hull([(0, 0), (1, 0), (0, 1)]),
+                return_exceptions=True), TIMEOUT)
+
+        self.assertIsInstance(results[0], ValueError)
+        self.assertEqual(results[1].tolist(), [True, False])
+        self.assertEqual(len(results[2]), 3)
+        self.assertEqual(service.stats()['containment_batches'], 1)
+
+    async def test_malformed_points_fail_at_the_call(self):
+
+        async with GeometryService() as service:
+
+            with self.assertRaises(ValueError):
+                await service.convex_hull([(0, 0, 0), (1, 1, 1)])
+
+        self.assertEqual(service.stats()['hull_requests'], 0)
+
+    async def test_hulls_match_monotone_chain(self):
+
+        point_sets = [self.rng.random((n, 2)) for n in (0, 1, 2, 3, 50, 500)]
+        point_sets.append(np.array([(0, 0), (1, 1), (2, 2), (3, 3)], dtype=np.float64))
+
+        async with GeometryService(max_batch_size=4, max_latency=0.01) as service:
+            hulls = await asyncio.wait_for(asyncio.gather(*(service.convex_hull(p) for p in point_sets)), TIMEOUT)
+
+        for points, hull in zip(point_sets, hulls):
+
+            expected = points[convex_hull_monotone_chain(points)] if len(points) else np.empty((0, 2))
+            self.assertEqual(hull.tolist(), expected.tolist())
+
+    async def test_containment_matches_in_poly(self):
+
+        points = self.rng.random((400, 2)) * 6 - 1
+        points[:4] = [(0, 0), (1.5, 4), (4, 2), (-0.5, 1)]
+
+        async with GeometryService(max_batch_size=8, max_latency=0.01) as service:
+
+            results = await asyncio.wait_for(asyncio.gather(*(service.contains(HEXAGON, points[i:i+50])
+                                                              for i in range(0, len(points), 50))), TIMEOUT)
+
+        expected = [Point(x, y).in_poly(HEXAGON) for x, y in points.tolist()]
+
+        self.assertEqual(np.concatenate(results).tolist(), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()